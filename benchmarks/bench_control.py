@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+bench_control.py — /sync-vault after one edit: standalone --once vs. the running instance.
+
+Usage:
+    python benchmarks/bench_control.py
+    python benchmarks/bench_control.py --files 50000
+
+Builds a synced project, edits one file and times the command /sync-vault runs, as a
+subprocess. "standalone" is `vault-sync.py --once` with no instance running: blueprint,
+state load, both tree walks and a state write. "control" is the same `--once` (and
+`--sync FILE`) answered by a continuous instance over its control socket.
+"""
+
+import argparse
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from common import REPO_ROOT, write_files
+
+SCRIPT = str(REPO_ROOT / "vault-sync.py")
+
+
+def run(root: Path, *args: str) -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, SCRIPT, *args], cwd=root, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - t0
+
+
+def edit(root: Path, n: int):
+    with open(root / "docs" / "d0000" / "f000000.md", "ab") as f:
+        f.write(b" edit %d" % n)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files",   type=int, default=20_000, help="Tracked files (default 20000).")
+    parser.add_argument("--per-dir", type=int, default=200,    help="Files per folder (default 200).")
+    parser.add_argument("--repeat",  type=int, default=3,      help="Timing repetitions (default 3).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root  = Path(tmp) / "proj"
+        vault = Path(tmp) / "vault"
+        for i in range(0, args.files, args.per_dir):
+            write_files(root, f"docs/d{i // args.per_dir:04d}", min(args.per_dir, args.files - i))
+        (vault / "p").mkdir(parents=True)
+        (root / "VAULT-BLUEPRINT.md").write_text(
+            f"---\nvault:\n  root: \"{vault.as_posix()}\"\n  project_path: \"p\"\n"
+            "sync:\n  include:\n    - docs/\n  exclude: []\n---\n")
+        run(root, "--once")   # initial sync
+
+        standalone = []
+        for n in range(args.repeat):
+            edit(root, n)
+            standalone.append(run(root, "--once"))
+
+        daemon = subprocess.Popen([sys.executable, SCRIPT], cwd=root, stdout=subprocess.DEVNULL)
+        try:
+            while not (root / ".vault-sync.sock").exists():
+                time.sleep(0.1)
+            control, sync = [], []
+            for n in range(args.repeat):
+                edit(root, 100 + n)
+                control.append(run(root, "--once"))
+                edit(root, 200 + n)
+                sync.append(run(root, "--sync", "docs/d0000/f000000.md"))
+        finally:
+            daemon.send_signal(signal.SIGINT)
+            daemon.wait()
+
+    print(f"files            : {args.files}")
+    print(f"standalone --once: {min(standalone) * 1000:8.1f} ms")
+    print(f"control --once   : {min(control) * 1000:8.1f} ms")
+    print(f"control --sync   : {min(sync) * 1000:8.1f} ms")
+    print(f"speedup (--sync) : {min(standalone) / min(sync):8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+bench_daemon.py — Watcher cost of N single-project instances vs. one multi-project daemon.
+
+Usage:
+    python benchmarks/bench_daemon.py
+    python benchmarks/bench_daemon.py --projects 20 --dirs 50
+
+Builds N projects (each with --dirs folders under docs/) mirrored into one vault and
+starts the watches each layout would create in-process. "per-project" is what N copies
+of vault-sync.py start: a local and a vault Observer per project. "daemon" is
+--projects/--discover: one Observer, watches on each project's include roots and one
+shared vault watch. Threads and inotify watches are sampled while the watches are live.
+"""
+
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from common import load_vault_sync, write_files
+
+vs = load_vault_sync()
+
+
+def build(root: Path, n: int, dirs: int) -> list:
+    """Create n projects under root and return their cfg dicts."""
+    cfgs = []
+    for p in range(n):
+        local = root / f"proj{p:03d}"
+        vault = root / "vault" / "01 - Projects" / f"proj{p:03d}"
+        for d in range(dirs):
+            write_files(local, f"docs/d{d:03d}", 2)
+            write_files(vault, f"docs/d{d:03d}", 2)
+        cfgs.append({"local_root": local, "vault_root": root / "vault", "vault_project": vault,
+                     "include": ["docs"], "exclude": []})
+    return cfgs
+
+
+def measure(cfgs: list, daemon: bool) -> dict:
+    handler   = FileSystemEventHandler()
+    base      = threading.active_count()
+    observers = []
+    if daemon:
+        observer = Observer()
+        for cfg in cfgs:
+            vs.IncludeWatches(observer, handler, cfg).refresh()
+        projects = {str(cfg["local_root"]): (cfg, None, None) for cfg in cfgs}
+        for vault_dir in vs.vault_watch_roots(projects):
+            observer.schedule(handler, vault_dir, recursive=True)
+        observers.append(observer)
+    else:
+        for cfg in cfgs:
+            for path in (cfg["local_root"], cfg["vault_project"]):
+                observer = Observer()
+                observer.schedule(handler, str(path), recursive=True)
+                observers.append(observer)
+    for observer in observers:
+        observer.start()
+    try:
+        stats = vs.watch_stats(observers[0])
+        stats["watches"] = sum(len(o.emitters) for o in observers)
+        stats["threads"] = threading.active_count() - base
+    finally:
+        for observer in observers:
+            observer.stop()
+        for observer in observers:
+            observer.join()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projects", type=int, default=10, help="Number of projects (default 10).")
+    parser.add_argument("--dirs", type=int, default=20, help="Folders per project and side (default 20).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cfgs = build(Path(tmp), args.projects, args.dirs)
+        single = measure(cfgs, daemon=False)
+        daemon = measure(cfgs, daemon=True)
+
+    print(f"projects         : {args.projects}")
+    print(f"{'':17s}  {'per-project':>12s}  {'daemon':>12s}")
+    for key in ("watches", "threads", "inotify_watches"):
+        if key in single:
+            print(f"{key:17s}: {single[key]:12d}  {daemon[key]:12d}")
+    if "max_rss_mb" in daemon:
+        print(f"peak RSS (MB)    : {daemon['max_rss_mb']:12.1f}  (process-wide high-water mark)")
+
+
+if __name__ == "__main__":
+    main()
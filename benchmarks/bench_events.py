@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+bench_events.py — Event storm replay: one sync_pair() per path vs. batched process_events().
+
+Usage:
+    python benchmarks/bench_events.py
+    python benchmarks/bench_events.py --files 5000
+
+Simulates a branch switch: every tracked local file changes at once and the debounced
+(source, path) keys are replayed. "per-path" syncs each key on its own (one journal write
+and one stdout flush each); "batched" drains them through process_events().
+Log output goes to os.devnull so flush cost is measured without filling the terminal.
+"""
+
+import argparse
+import contextlib
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from common import load_vault_sync, write_files
+
+vs = load_vault_sync()
+
+
+def storm(n: int, batched: bool) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            root = Path(tmp)
+            for i in range(0, n, 500):
+                write_files(root / "local", f"docs/d{i // 500:04d}", min(500, n - i))
+            (root / "vault").mkdir()
+            cfg   = {"local_root": root / "local", "vault_project": root / "vault",
+                     "include": ["docs"], "exclude": []}
+            state = vs.load_state()
+            lock  = threading.Lock()
+            keys  = [("local", str(cfg["local_root"] / rel)) for rel in sorted(vs.scan_side(cfg["local_root"], cfg))]
+
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                t0 = time.perf_counter()
+                if batched:
+                    for i in range(0, len(keys), vs.BATCH_MAX):
+                        vs.process_events(cfg, state, lock, keys[i:i + vs.BATCH_MAX])
+                else:
+                    for source, path_str in keys:
+                        rel_str = vs.event_rel(cfg, source, path_str)
+                        vs.sync_pair(cfg["local_root"] / rel_str, cfg["vault_project"] / rel_str,
+                                     rel_str, state, lock)
+                elapsed = time.perf_counter() - t0
+            vs.save_state(state, lock)
+        finally:
+            os.chdir(cwd)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=3000, help="Files touched by the storm (default 3000).")
+    args = parser.parse_args()
+
+    t_single  = storm(args.files, batched=False)
+    t_batched = storm(args.files, batched=True)
+    print(f"files            : {args.files}")
+    print(f"per-path         : {args.files / t_single:8.0f} files/s")
+    print(f"batched          : {args.files / t_batched:8.0f} files/s")
+    print(f"speedup          : {t_single / t_batched:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
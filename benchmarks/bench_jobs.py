@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+bench_jobs.py — Cold reconcile scaling with the number of --jobs worker threads.
+
+Usage:
+    python benchmarks/bench_jobs.py
+    python benchmarks/bench_jobs.py --files 20000 --size 65536 --jobs 1 2 4 8 16
+
+Each run reconciles a fresh synthetic tree (every file new locally, empty vault), so
+every path is hashed and copied. Scaling depends on the disks: on one fast local disk
+SHA-256 dominates; on a slow or network-mounted vault copy latency overlaps well.
+"""
+
+import argparse
+import contextlib
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from common import load_vault_sync, write_files
+
+vs = load_vault_sync()
+
+
+def run(files: int, size: int, jobs: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            root = Path(tmp)
+            for i in range(0, files, 500):
+                write_files(root / "local", f"docs/d{i // 500:04d}", min(500, files - i), size)
+            (root / "vault").mkdir()
+            cfg = {"local_root": root / "local", "vault_project": root / "vault",
+                   "include": ["docs"], "exclude": []}
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                t0 = time.perf_counter()
+                vs.reconcile(cfg, vs.load_state(), threading.Lock(), jobs=jobs)
+                return time.perf_counter() - t0
+        finally:
+            os.chdir(cwd)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=5000,  help="Files in the tree (default 5000).")
+    parser.add_argument("--size",  type=int, default=16384, help="Bytes per file (default 16384).")
+    parser.add_argument("--jobs",  type=int, nargs="+", default=[1, 2, 4, vs.DEFAULT_JOBS],
+                        help=f"Worker counts to test (default 1 2 4 {vs.DEFAULT_JOBS}).")
+    args = parser.parse_args()
+
+    base = None
+    print(f"{'jobs':>5}  {'seconds':>8}  {'files/s':>8}  {'speedup':>7}")
+    for jobs in args.jobs:
+        t = run(args.files, args.size, jobs)
+        base = base or t
+        print(f"{jobs:>5}  {t:>8.2f}  {args.files / t:>8.0f}  {base / t:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
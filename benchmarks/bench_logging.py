@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+bench_logging.py — Log output cost of a reconcile pass that checks every file: quiet, default, verbose.
+
+Usage:
+    python benchmarks/bench_logging.py
+    python benchmarks/bench_logging.py --files 20000 --script /tmp/old-vault-sync.py
+
+Runs `--once --verify` on a synced project as a subprocess whose stdout is a pipe read by
+this process — every file goes through sync_pair() and ends up skipped, the case where the
+per-file lines used to dominate — once per log mode: --quiet, the default, --verbose (one
+skip line per file) and --verbose with a JSON-lines --log-file. --script times the default
+mode of another copy of the script for comparison. The line counts are what reached stdout.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from common import REPO_ROOT
+from generate import generate
+
+
+def timed(cmd: list, cwd: Path, repeat: int) -> tuple:
+    """(best ms, median ms, stdout lines) over repeat runs of cmd."""
+    runs, lines = [], 0
+    for _ in range(repeat):
+        t0  = time.perf_counter()
+        out = subprocess.run(cmd, cwd=cwd, check=True, stdout=subprocess.PIPE).stdout
+        runs.append((time.perf_counter() - t0) * 1000)
+        lines = out.count(b"\n")
+    return min(runs), statistics.median(runs), lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files",  type=int,  default=5000, help="Tracked files (default 5000).")
+    parser.add_argument("--repeat", type=int,  default=5,    help="Runs per mode (default 5).")
+    parser.add_argument("--script", type=Path, action="append", default=[],
+                        help="Another vault-sync.py to time in its default mode as well (repeatable).")
+    args = parser.parse_args()
+
+    script = REPO_ROOT / "vault-sync.py"
+    with tempfile.TemporaryDirectory() as tmp:
+        cfg   = generate(Path(tmp), files=args.files, noise=0.0)
+        local = cfg["local_root"]
+        subprocess.run([sys.executable, str(script), "--once"], cwd=local, check=True,
+                       stdout=subprocess.DEVNULL)   # baseline: the timed runs have nothing to sync
+
+        once  = [sys.executable, str(script), "--once", "--verify"]
+        modes = [("--quiet", once + ["-q"]), ("default", once), ("--verbose", once + ["-v"]),
+                 ("--verbose --log-file", once + ["-v", "--log-file", str(Path(tmp) / "log.jsonl")])]
+        modes += [(f"default [{p.name}]", [sys.executable, str(p.resolve()), "--once", "--verify"])
+                  for p in args.script]
+
+        print(f"files            : {args.files}")
+        print(f"{'':21s}  {'best ms':>8s}  {'median ms':>9s}  {'lines':>6s}")
+        for name, cmd in modes:
+            best, median, lines = timed(cmd, local, args.repeat)
+            print(f"{name:21s}: {best:8.1f}  {median:9.1f}  {lines:6d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+bench_match.py — Include/exclude filtering: legacy per-pattern loop vs. compiled PathMatcher.
+
+Usage:
+    python benchmarks/bench_match.py
+    python benchmarks/bench_match.py --paths 500000
+
+Feeds a mix of tracked docs and a .pio/.git build event storm through both filters
+and checks they agree on every path.
+"""
+
+import argparse
+import fnmatch
+import random
+from pathlib import Path
+
+from common import best_of, load_vault_sync
+
+vs = load_vault_sync()
+
+INCLUDE = ["docs", "Report", "lessonsLearned", "CLAUDE.md", "VAULT-BLUEPRINT.md", ".claude/rules"]
+EXCLUDE = ["src", "include", "tests", "CLAUDE.local.md", ".vault-sync-state.json", "*.obsidian-*.md"]
+
+
+def legacy_is_included(rel: Path, cfg: dict) -> bool:
+    """The pre-matcher filter: every exclude, then every include, per path."""
+    rel_posix = rel.as_posix()
+    for pattern in cfg["exclude"]:
+        if rel_posix == pattern or rel_posix.startswith(pattern + "/"):
+            return False
+        if fnmatch.fnmatch(rel.name, pattern):
+            return False
+    for pattern in cfg["include"]:
+        if rel_posix == pattern or rel_posix.startswith(pattern + "/"):
+            return True
+    return False
+
+
+def make_paths(count: int) -> list:
+    rng = random.Random(42)
+    paths = []
+    for i in range(count):
+        if i % 10 == 0:
+            paths.append(f"docs/section{rng.randrange(20)}/note{rng.randrange(500)}.md")
+        else:
+            noise = rng.choice([".pio/build/target/src", ".git/objects", "build/CMakeFiles", "src"])
+            paths.append(f"{noise}/d{rng.randrange(200)}/o{rng.randrange(5000)}.o")
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--paths",  type=int, default=200_000, help="Paths to filter (default 200000).")
+    parser.add_argument("--repeat", type=int, default=3,       help="Timing repetitions (default 3).")
+    args = parser.parse_args()
+
+    rel_strs = make_paths(args.paths)
+    rels     = [Path(p) for p in rel_strs]
+    cfg      = {"include": INCLUDE, "exclude": EXCLUDE}
+    matcher  = vs.PathMatcher(INCLUDE, EXCLUDE)
+    assert [legacy_is_included(r, cfg) for r in rels] == [matcher.matches(p) for p in rel_strs]
+
+    t_legacy  = best_of(lambda: [legacy_is_included(r, cfg) for r in rels], args.repeat)
+    t_matcher = best_of(lambda: [matcher.matches(p) for p in rel_strs], args.repeat)
+
+    print(f"paths            : {args.paths}")
+    print(f"legacy filter    : {t_legacy * 1e9 / args.paths:8.0f} ns/path")
+    print(f"PathMatcher      : {t_matcher * 1e9 / args.paths:8.0f} ns/path")
+    print(f"speedup          : {t_legacy / t_matcher:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
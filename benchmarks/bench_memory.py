@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+bench_memory.py — Resident size of the in-memory state: dict per file vs. compact SyncState.
+
+Usage:
+    python benchmarks/bench_memory.py                   # 10k, 100k and 1M entries
+    python benchmarks/bench_memory.py --sizes 10000 50000
+
+For each size, N synthetic entries (paths shaped like lessons-learned and report archives,
+sha256 digests, both stat signatures) are loaded the way load_state() does, once into a
+plain {rel: {"checksum", "last_sync", "local_sig", "vault_sig"}} dict — the previous layout —
+and once into SyncState. Memory is the tracemalloc delta, path strings included.
+"""
+
+import argparse
+import gc
+import hashlib
+import json
+import time
+import tracemalloc
+
+from common import load_vault_sync
+
+vs = load_vault_sync()
+
+
+def snapshot_text(n: int) -> str:
+    """The "files" object of a state snapshot with n entries, as JSON text."""
+    now, files = time.time(), {}
+    for i in range(n):
+        rel = f"docs/lessons/{2015 + i % 10}/topic-{i // 1000:04d}/note-{i:07d}.md"
+        files[rel] = {
+            "checksum":  hashlib.sha256(rel.encode()).hexdigest(),
+            "last_sync": now - i,
+            "local_sig": [1000 + i % 5000, 1_700_000_000_000_000_000 + i, 10_000_000 + 2 * i],
+            "vault_sig": [1000 + i % 5000, 1_700_000_000_000_000_000 + i, 10_000_001 + 2 * i],
+        }
+    return json.dumps(files)
+
+
+def measure(load) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    obj = load()
+    elapsed = time.perf_counter() - t0
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="Entry counts to measure (default 10000 100000 1000000).")
+    args = parser.parse_args()
+
+    def compact(text: str) -> "vs.SyncState":
+        state = vs.SyncState()
+        state.update(json.loads(text))
+        return state
+
+    print(f"{'entries':>9s}  {'dict MB':>9s}  {'compact MB':>10s}  {'B/entry':>15s}  {'ratio':>6s}")
+    for n in args.sizes:
+        text = snapshot_text(n)
+        plain, _   = measure(lambda: json.loads(text))
+        packed, _  = measure(lambda: compact(text))
+        print(f"{n:9d}  {plain / 2**20:9.1f}  {packed / 2**20:10.1f}  "
+              f"{plain // n:7d} -> {packed // n:4d}  {plain / packed:6.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+bench_metrics.py — Cost of the metrics layer: reconcile() with metrics disabled vs. enabled.
+
+Usage:
+    python benchmarks/bench_metrics.py
+    python benchmarks/bench_metrics.py --files 20000 --repeat 5
+
+Times the first sync of a project (every file hashed and copied) and a --verify pass over
+the synced project (every file re-hashed), once with metrics.enabled False — the default —
+and once with it True, then renders the collected samples the way the stats file and the
+/metrics endpoint would.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from common import load_vault_sync, write_files
+
+vs = load_vault_sync()
+
+
+def run(files: int, per_dir: int, enabled: bool) -> dict:
+    vs.metrics.enabled = enabled
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for i in range(0, files, per_dir):
+            write_files(root / "local", f"docs/d{i // per_dir:04d}", min(per_dir, files - i))
+        (root / "vault").mkdir()
+        cfg   = {"local_root": root / "local", "vault_project": root / "vault",
+                 "include": ["docs"], "exclude": []}
+        state = vs.load_state(root)
+        lock  = threading.Lock()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            t0 = time.perf_counter()
+            vs.reconcile(cfg, state, lock)
+            first = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            vs.reconcile(cfg, state, lock, verify=True)
+            verify = time.perf_counter() - t0
+    return {"first": first, "verify": verify}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files",   type=int, default=10_000, help="Tracked files (default 10000).")
+    parser.add_argument("--per-dir", type=int, default=200,    help="Files per folder (default 200).")
+    parser.add_argument("--repeat",  type=int, default=3,      help="Timing repetitions (default 3).")
+    args = parser.parse_args()
+
+    off = {"first": float("inf"), "verify": float("inf")}
+    on  = dict(off)
+    for _ in range(args.repeat):
+        for best, enabled in ((off, False), (on, True)):
+            for phase, t in run(args.files, args.per_dir, enabled).items():
+                best[phase] = min(best[phase], t)
+
+    t0 = time.perf_counter()
+    text = json.dumps(vs.metrics.snapshot())
+    snapshot = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    vs.metrics.prometheus()
+    scrape = time.perf_counter() - t0
+
+    print(f"files            : {args.files}")
+    print(f"{'':17s}  {'disabled':>10s}  {'enabled':>10s}")
+    print(f"first sync (ms)  : {off['first'] * 1000:10.1f}  {on['first'] * 1000:10.1f}")
+    print(f"verify pass (ms) : {off['verify'] * 1000:10.1f}  {on['verify'] * 1000:10.1f}")
+    print(f"stats file       : {snapshot * 1000:8.2f} ms ({len(text)} bytes)")
+    print(f"/metrics render  : {scrape * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
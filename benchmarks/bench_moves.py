@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+bench_moves.py — Reorganizing an attachment folder: move replay vs. copy under the new name.
+
+Usage:
+    python benchmarks/bench_moves.py
+    python benchmarks/bench_moves.py --files 200 --size-kb 2048
+
+Syncs --files attachments, moves the whole folder on the vault side, and times the
+reconcile() that follows. "copy" disables replay_moves(), which is what happened before:
+every file is copied to local under its new name. "rename" replays the moves.
+"""
+
+import argparse
+import contextlib
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from common import load_vault_sync
+
+vs = load_vault_sync()
+
+
+def run(n: int, size: int, replay: bool) -> tuple:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        att  = root / "local" / "docs" / "attachments"
+        att.mkdir(parents=True)
+        for i in range(n):
+            (att / f"img{i:05d}.png").write_bytes(os.urandom(size))
+        (root / "vault").mkdir()
+        cfg   = {"local_root": root / "local", "vault_project": root / "vault",
+                 "include": ["docs"], "exclude": []}
+        state = vs.load_state(root)
+        lock  = threading.Lock()
+        t = time.time() - 60
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            vs.reconcile(cfg, state, lock)
+            for dirpath, _, names in os.walk(root):
+                for name in names:
+                    os.utime(os.path.join(dirpath, name), (t, t))
+            vs.reconcile(cfg, state, lock, full=True)   # record signatures
+
+            os.rename(root / "vault" / "docs" / "attachments", root / "vault" / "docs" / "assets")
+            original = vs.replay_moves
+            if not replay:
+                vs.replay_moves = lambda cfg, state, lock, rel_strs, *a: rel_strs
+            try:
+                t0 = time.perf_counter()
+                vs.reconcile(cfg, state, lock)
+                elapsed = time.perf_counter() - t0
+            finally:
+                vs.replay_moves = original
+        vs.save_state(state, lock)
+        copied = sum(1 for _ in (root / "local" / "docs" / "assets").iterdir())
+    return elapsed, copied
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files",   type=int, default=100,  help="Attachments in the folder (default 100).")
+    parser.add_argument("--size-kb", type=int, default=1024, help="Size of each attachment in KiB (default 1024).")
+    args = parser.parse_args()
+
+    t_copy, n_copy     = run(args.files, args.size_kb * 1024, replay=False)
+    t_rename, n_rename = run(args.files, args.size_kb * 1024, replay=True)
+    assert n_copy == n_rename == args.files
+    print(f"attachments      : {args.files} x {args.size_kb} KiB")
+    print(f"copy             : {t_copy * 1000:8.1f} ms")
+    print(f"rename           : {t_rename * 1000:8.1f} ms")
+    print(f"speedup          : {t_copy / t_rename:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+bench_pipeline.py — Streaming reconcile() vs. collect-then-sync: time to first copy and peak memory.
+
+Usage:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --files 100000 --jobs 8
+
+"collect" is how reconcile() used to run: walk both trees into dicts, sort the union of
+their paths, then sync. "stream" is the current pipeline, which merges the two walks on
+the fly and syncs each path as soon as both sides have been seen.
+
+Two scenarios: the first sync of a project (every file is copied to the empty vault) —
+reported as time until the first file is copied and total time — and a --full pass over
+the synced project, reported as the tracemalloc peak while it runs.
+"""
+
+import argparse
+import contextlib
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+from common import load_vault_sync, write_files
+
+vs = load_vault_sync()
+
+
+def collect_reconcile(cfg: dict, state, lock, jobs: int):
+    """The pre-pipeline reconcile(): full walks first, then one sorted batch."""
+    local_stats = vs.scan_side(cfg["local_root"], cfg)
+    vault_stats = vs.scan_side(cfg["vault_project"], cfg)
+    rel_paths   = sorted(local_stats.keys() | vault_stats.keys())
+    vs.sync_batch(cfg, state, lock, rel_paths, local_stats, vault_stats, jobs=jobs)
+    vs.save_state(state, lock)
+
+
+class FirstCopy(list):
+    """Log tap that notes when the first SYNC line arrives."""
+
+    def __init__(self):
+        super().__init__()
+        self.at = None
+
+    def append(self, line):
+        if self.at is None and "[SYNC" in line:
+            self.at = time.perf_counter()
+
+
+def run(files: int, per_dir: int, jobs: int, stream: bool) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for i in range(0, files, per_dir):
+            write_files(root / "local", f"docs/d{i // per_dir:04d}", min(per_dir, files - i))
+        (root / "vault").mkdir()
+        cfg   = {"local_root": root / "local", "vault_project": root / "vault",
+                 "include": ["docs"], "exclude": []}
+        state = vs.load_state(root)
+        lock  = threading.Lock()
+
+        def once(full: bool = False):
+            if stream:
+                vs.reconcile(cfg, state, lock, jobs=jobs, full=full)
+            else:
+                collect_reconcile(cfg, state, lock, jobs)
+
+        tap   = FirstCopy()
+        entry = (vs.LOG_LEVELS["info"], tap)
+        vs._log_taps.append(entry)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            t0 = time.perf_counter()
+            try:
+                once()
+            finally:
+                vs._log_taps.remove(entry)
+            total = time.perf_counter() - t0
+
+            tracemalloc.start()
+            once(full=True)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        vs.save_state(state, lock)
+    return {"first": tap.at - t0, "total": total, "peak": peak}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files",   type=int, default=50_000, help="Tracked files (default 50000).")
+    parser.add_argument("--per-dir", type=int, default=200,    help="Files per folder (default 200).")
+    parser.add_argument("--jobs",    type=int, default=vs.DEFAULT_JOBS,
+                        help=f"Hash/copy workers (default {vs.DEFAULT_JOBS}).")
+    args = parser.parse_args()
+
+    collect = run(args.files, args.per_dir, args.jobs, stream=False)
+    stream  = run(args.files, args.per_dir, args.jobs, stream=True)
+    print(f"files            : {args.files} ({args.jobs} worker(s))")
+    print(f"{'':17s}  {'collect':>10s}  {'stream':>10s}")
+    print(f"first copy (ms)  : {collect['first'] * 1000:10.1f}  {stream['first'] * 1000:10.1f}")
+    print(f"first sync (ms)  : {collect['total'] * 1000:10.1f}  {stream['total'] * 1000:10.1f}")
+    print(f"full pass peak MB: {collect['peak'] / 2**20:10.1f}  {stream['peak'] / 2**20:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
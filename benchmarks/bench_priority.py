@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+bench_priority.py — Latency of the note just edited when a pass has many other files to sync.
+
+Usage:
+    python benchmarks/bench_priority.py
+    python benchmarks/bench_priority.py --reports 5000 --size-kb 64
+
+A project has --reports untouched Report/ files (older mtimes) that still need copying to
+the vault — a first sync, or a vault restored from backup — plus one note in docs/ that
+was just edited. The startup reconcile() is timed until that note has been copied.
+"lexical" syncs in path order, as reconcile() did before; "recency" is the current
+most-recently-edited-first order.
+"""
+
+import argparse
+import contextlib
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from common import load_vault_sync
+
+vs = load_vault_sync()
+
+
+class WaitFor(list):
+    """Log tap that notes when a SYNC line for one path arrives."""
+
+    def __init__(self, rel_str: str):
+        super().__init__()
+        self.rel_str = rel_str
+        self.at = None
+
+    def append(self, line):
+        if self.at is None and "[SYNC" in line and self.rel_str in line:
+            self.at = time.perf_counter()
+
+
+def run(reports: int, size: int, recency: bool) -> tuple:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        rep  = root / "local" / "Report"
+        rep.mkdir(parents=True)
+        old  = time.time() - 86400
+        for i in range(reports):
+            f = rep / f"r{i:05d}.md"
+            f.write_bytes(os.urandom(size))
+            os.utime(f, (old, old))
+        (root / "local" / "docs").mkdir()
+        (root / "local" / "docs" / "note.md").write_text("just edited\n")
+        (root / "vault").mkdir()
+        cfg   = {"local_root": root / "local", "vault_project": root / "vault",
+                 "include": ["docs", "Report"], "exclude": []}
+        state = vs.load_state(root)
+        lock  = threading.Lock()
+
+        tap      = WaitFor("docs/note.md")
+        entry    = (vs.LOG_LEVELS["info"], tap)
+        original = vs.by_recency
+        if not recency:
+            vs.by_recency = lambda pairs, window=None: pairs
+        vs._log_taps.append(entry)
+        try:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                t0 = time.perf_counter()
+                vs.reconcile(cfg, state, lock)
+                total = time.perf_counter() - t0
+        finally:
+            vs._log_taps.remove(entry)
+            vs.by_recency = original
+        vs.save_state(state, lock)
+    return tap.at - t0, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--reports", type=int, default=2000, help="Report/ files to sync (default 2000).")
+    parser.add_argument("--size-kb", type=int, default=16,   help="Size of each report in KiB (default 16).")
+    args = parser.parse_args()
+
+    lex_note, lex_total = run(args.reports, args.size_kb * 1024, recency=False)
+    rec_note, rec_total = run(args.reports, args.size_kb * 1024, recency=True)
+    print(f"reports          : {args.reports} x {args.size_kb} KiB")
+    print(f"{'':17s}  {'lexical':>10s}  {'recency':>10s}")
+    print(f"note synced (ms) : {lex_note * 1000:10.1f}  {rec_note * 1000:10.1f}")
+    print(f"pass total (ms)  : {lex_total * 1000:10.1f}  {rec_total * 1000:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
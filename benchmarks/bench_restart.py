@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+bench_restart.py — Startup reconcile on a quiet project: --full vs. the directory index.
+
+Usage:
+    python benchmarks/bench_restart.py
+    python benchmarks/bench_restart.py --files 50000 --per-dir 100
+
+Builds an already-synced project (identical local and vault trees, baseline recorded,
+mtimes backdated past the racy window) and times the startup reconcile() nothing has
+changed since: "full" re-lists every folder and runs sync_pair() on every file, "indexed"
+reuses the state's directory listings and skips files whose signatures still match.
+"""
+
+import argparse
+import contextlib
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from common import best_of, load_vault_sync, write_files
+
+vs = load_vault_sync()
+
+
+def backdate(root: Path, seconds: float = 60.0):
+    t = time.time() - seconds
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            os.utime(os.path.join(dirpath, name), (t, t))
+        os.utime(dirpath, (t, t))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files",   type=int, default=10_000, help="Tracked files (default 10000).")
+    parser.add_argument("--per-dir", type=int, default=200,    help="Files per folder (default 200).")
+    parser.add_argument("--repeat",  type=int, default=3,      help="Timing repetitions (default 3).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for i in range(0, args.files, args.per_dir):
+            write_files(root / "local", f"docs/d{i // args.per_dir:04d}", min(args.per_dir, args.files - i))
+        (root / "vault").mkdir()
+        cfg = {"local_root": root / "local", "vault_project": root / "vault",
+               "include": ["docs"], "exclude": []}
+        state = vs.load_state(root)
+        lock  = threading.Lock()
+
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            vs.reconcile(cfg, state, lock, full=True)   # initial sync: baseline
+            backdate(root)
+            vs.reconcile(cfg, state, lock, full=True)   # signatures, now past the racy window
+            t_full    = best_of(lambda: vs.reconcile(cfg, state, lock, full=True), args.repeat)
+            vs.reconcile(cfg, state, lock)
+            t_indexed = best_of(lambda: vs.reconcile(cfg, state, lock), args.repeat)
+        vs.save_state(state, lock)
+
+    print(f"files            : {args.files} ({args.per_dir} per folder)")
+    print(f"full             : {t_full * 1000:8.1f} ms")
+    print(f"indexed          : {t_indexed * 1000:8.1f} ms")
+    print(f"speedup          : {t_full / t_indexed:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
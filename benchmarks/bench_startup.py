@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+bench_startup.py — Process start to exit of short vault-sync.py commands (editor hooks, /sync-vault).
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --script /tmp/old-vault-sync.py   # e.g. git show HEAD~1:vault-sync.py
+
+Times `--once` on a small synced project with nothing to do, with and without the cached
+blueprint (.vault-sync-blueprint.json is deleted before every "no cache" run), and `--clean`,
+as subprocesses — the way an editor hook runs them. "python -c pass" is the interpreter's
+own start. --script runs the same commands against another copy of the script for comparison.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from common import REPO_ROOT
+from generate import generate
+
+CACHE = ".vault-sync-blueprint.json"
+
+
+def timed(cmd: list, cwd: Path, repeat: int, before=None) -> tuple:
+    """(best, median) wall time in ms over repeat runs of cmd."""
+    runs = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        t0 = time.perf_counter()
+        subprocess.run(cmd, cwd=cwd, check=True, stdout=subprocess.DEVNULL)
+        runs.append((time.perf_counter() - t0) * 1000)
+    return min(runs), statistics.median(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files",  type=int,  default=200, help="Tracked files (default 200).")
+    parser.add_argument("--repeat", type=int,  default=15,  help="Runs per command (default 15).")
+    parser.add_argument("--script", type=Path, action="append", default=[],
+                        help="Another vault-sync.py to time as well (repeatable).")
+    args = parser.parse_args()
+
+    scripts = [REPO_ROOT / "vault-sync.py"] + [p.resolve() for p in args.script]
+    with tempfile.TemporaryDirectory() as tmp:
+        cfg   = generate(Path(tmp), files=args.files, noise=0.0)
+        local = cfg["local_root"]
+        subprocess.run([sys.executable, str(scripts[0]), "--once"], cwd=local, check=True,
+                       stdout=subprocess.DEVNULL)   # baseline: the timed runs have nothing to sync
+
+        def drop_cache():
+            (local / CACHE).unlink(missing_ok=True)
+
+        best, median = timed([sys.executable, "-c", "pass"], local, args.repeat)
+        print(f"{'':27s}  {'best ms':>8s}  {'median ms':>9s}")
+        print(f"{'python -c pass':27s}: {best:8.1f}  {median:9.1f}")
+        for script in scripts:
+            label = "" if script == scripts[0] else f" [{script.name}]"
+            for name, extra, before in (("--once (no cache)", ["--once"], drop_cache),
+                                        ("--once", ["--once"], None),
+                                        ("--clean", ["--clean"], None)):
+                best, median = timed([sys.executable, str(script), *extra], local, args.repeat, before)
+                print(f"{name + label:27s}: {best:8.1f}  {median:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+bench_state.py — Reconcile throughput with the journaled state store vs. the legacy full rewrite.
+
+Usage:
+    python benchmarks/bench_state.py                  # 10k and 100k tracked files
+    python benchmarks/bench_state.py --sizes 2000 10000
+
+For each size, a project with N new local files is reconciled into an empty vault
+(N copies, N state records) and files/s is reported. The legacy store rewrote the whole
+JSON state on every copy; running that for real is O(N²), so its cost is estimated by
+timing the indent=2 rewrite at several state sizes and integrating over the N saves.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from common import load_vault_sync, write_files
+
+vs = load_vault_sync()
+
+
+def make_cfg(root: Path) -> dict:
+    vault = root / "vault"
+    vault.mkdir()
+    return {
+        "local_root":    root / "local",
+        "vault_project": vault,
+        "include":       ["docs"],
+        "exclude":       [],
+    }
+
+
+def legacy_save_cost(entries: int) -> float:
+    """Seconds for one legacy save_state() (indent=2 rewrite) of a state with `entries` files."""
+    entry = {"checksum": "0" * 64, "last_sync": time.time(),
+             "local_sig": [1024, time.time_ns(), 1], "vault_sig": [1024, time.time_ns(), 2]}
+    state = {f"docs/d{i // 500:04d}/f{i:06d}.md": dict(entry) for i in range(entries)}
+    path = Path("legacy-state.json")
+    t0 = time.perf_counter()
+    path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+    return time.perf_counter() - t0
+
+
+def run_size(n: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            root = Path(tmp)
+            for i in range(0, n, 500):
+                write_files(root / "local", f"docs/d{i // 500:04d}", min(500, n - i))
+            cfg   = make_cfg(root)
+            state = vs.load_state()
+            lock  = threading.Lock()
+
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                t0 = time.perf_counter()
+                vs.reconcile(cfg, state, lock)
+                journal_s = time.perf_counter() - t0
+
+            # Legacy: same copies, plus one full rewrite per copy at a growing state size.
+            points  = [max(1, n * k // 4) for k in range(1, 5)]
+            costs   = [legacy_save_cost(p) for p in points]
+            rewrite = 0.0
+            prev_p, prev_c = 0, 0.0
+            for p, c in zip(points, costs):
+                rewrite += (p - prev_p) * (prev_c + c) / 2
+                prev_p, prev_c = p, c
+            legacy_s = journal_s + rewrite
+        finally:
+            os.chdir(cwd)
+    return {"files": n, "journal_s": journal_s, "legacy_s": legacy_s}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000],
+                        help="Tracked file counts to test (default 10000 100000).")
+    args = parser.parse_args()
+
+    print(f"{'files':>8}  {'journal files/s':>16}  {'legacy files/s (est.)':>22}")
+    for n in args.sizes:
+        r = run_size(n)
+        print(f"{r['files']:>8}  {n / r['journal_s']:>16.0f}  {n / r['legacy_s']:>22.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+bench_walk.py — Tree walk benchmark: legacy rglob scan vs. include-rooted scan_side().
+
+Usage:
+    python benchmarks/bench_walk.py                     # default tree
+    python benchmarks/bench_walk.py --docs 500 --noise 200000
+
+Builds a temporary project whose tracked docs are buried in .pio/, .git/ and build/
+noise, then times both walkers over it. Both must find the same set of files.
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from common import best_of, load_vault_sync, write_files
+
+vs = load_vault_sync()
+
+
+def legacy_walk(root: Path, cfg: dict) -> set:
+    """The pre-scandir walker: rglob the whole tree, filter every path."""
+    found = set()
+    for f in root.rglob("*"):
+        if not f.is_file():
+            continue
+        rel = f.relative_to(root)
+        if vs.is_included(rel, cfg):
+            found.add(rel.as_posix())
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs",   type=int, default=400,    help="Tracked files (default 400).")
+    parser.add_argument("--noise",  type=int, default=50_000, help="Build-artifact files (default 50000).")
+    parser.add_argument("--repeat", type=int, default=3,      help="Timing repetitions (default 3).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        per_dir = 500
+        for i in range(0, args.docs, 100):
+            write_files(root, f"docs/section{i // 100}", min(100, args.docs - i))
+        for i in range(0, args.noise, per_dir):
+            bucket = i // per_dir
+            noise_root = (".pio/build", ".git/objects", "build")[bucket % 3]
+            write_files(root, f"{noise_root}/d{bucket:04d}", min(per_dir, args.noise - i), size=64)
+        (root / "CLAUDE.md").write_text("briefing\n")
+
+        cfg = {
+            "local_root": root,
+            "include":    ["docs", "Report", "lessonsLearned", "CLAUDE.md", ".claude/rules"],
+            "exclude":    ["src", "include", "tests", ".vault-sync-state.json", "*.obsidian-*.md"],
+        }
+
+        legacy = legacy_walk(root, cfg)
+        scanned = set(vs.scan_side(root, cfg))
+        assert legacy == scanned, "walkers disagree"
+
+        t_legacy = best_of(lambda: legacy_walk(root, cfg), args.repeat)
+        t_scan   = best_of(lambda: vs.scan_side(root, cfg), args.repeat)
+
+    print(f"tracked files : {len(scanned)}")
+    print(f"noise files   : {args.noise}")
+    print(f"rglob walk    : {t_legacy * 1000:9.1f} ms")
+    print(f"scan_side     : {t_scan * 1000:9.1f} ms")
+    print(f"speedup       : {t_legacy / t_scan:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+bench_watch.py — Watches and events per build: whole project folder vs. include roots only.
+
+Usage:
+    python benchmarks/bench_watch.py
+    python benchmarks/bench_watch.py --build-dirs 400 --objects 20
+
+Builds a project with docs/ (tracked) next to a .pio/build tree (ignored), then replays a
+"build": every build folder gets --objects fresh object files. "whole-root" is the old
+recursive watch on the project folder; "include-only" is IncludeWatches. Reports the
+inotify watches held and how many events the observer delivered to the handler.
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from common import load_vault_sync, write_files
+
+vs = load_vault_sync()
+
+
+class Counter(FileSystemEventHandler):
+    def __init__(self):
+        self.events = 0
+        self.lock   = threading.Lock()
+
+    def dispatch(self, event):
+        with self.lock:
+            self.events += 1
+
+
+def run(root: Path, cfg: dict, build_dirs: int, objects: int, include_only: bool, round_no: int) -> dict:
+    handler  = Counter()
+    observer = Observer()
+    if include_only:
+        vs.IncludeWatches(observer, handler, cfg).refresh()
+    else:
+        observer.schedule(handler, str(root), recursive=True)
+    observer.start()
+    try:
+        inotify = vs.watch_stats(observer).get("inotify_watches")
+        for d in range(build_dirs):
+            out = root / ".pio" / "build" / f"m{d:04d}"
+            for o in range(objects):
+                (out / f"o{o:03d}.o").write_bytes(b"obj %d" % round_no)
+        time.sleep(1.0)   # let the emitter drain
+    finally:
+        observer.stop()
+        observer.join()
+    return {"watches": inotify, "events": handler.events}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--build-dirs", type=int, default=200, help="Folders under .pio/build (default 200).")
+    parser.add_argument("--objects", type=int, default=10, help="Object files written per folder (default 10).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write_files(root, "docs", 50)
+        (root / "CLAUDE.md").write_text("c")
+        for d in range(args.build_dirs):
+            (root / ".pio" / "build" / f"m{d:04d}").mkdir(parents=True)
+        cfg = {"local_root": root, "include": ["docs", "CLAUDE.md"], "exclude": []}
+
+        whole   = run(root, cfg, args.build_dirs, args.objects, include_only=False, round_no=1)
+        include = run(root, cfg, args.build_dirs, args.objects, include_only=True, round_no=2)
+
+    print(f"build            : {args.build_dirs} folders x {args.objects} objects")
+    print(f"{'':17s}  {'whole-root':>12s}  {'include-only':>12s}")
+    if whole["watches"] is not None:
+        print(f"inotify watches  : {whole['watches']:12d}  {include['watches']:12d}")
+    print(f"events per build : {whole['events']:12d}  {include['events']:12d}")
+
+
+if __name__ == "__main__":
+    main()
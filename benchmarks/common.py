@@ -0,0 +1,44 @@
+"""
+common.py — Shared helpers for the vault-sync.py benchmarks.
+
+vault-sync.py has a hyphen in its name, so it cannot be imported directly;
+load_vault_sync() loads it from the repository root as a module.
+"""
+
+import importlib.util
+import os
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_vault_sync():
+    """Import vault-sync.py from the repository root and return the module."""
+    if "vault_sync" in sys.modules:
+        return sys.modules["vault_sync"]
+    spec = importlib.util.spec_from_file_location("vault_sync", REPO_ROOT / "vault-sync.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["vault_sync"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_files(root: Path, rel_dir: str, count: int, size: int = 256):
+    """Create count small files under root/rel_dir."""
+    d = root / rel_dir
+    d.mkdir(parents=True, exist_ok=True)
+    payload = os.urandom(size)
+    for i in range(count):
+        (d / f"f{i:06d}.md").write_bytes(payload + str(i).encode())
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    """Return the fastest wall time in seconds over repeat calls of fn()."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+generate.py — Synthetic project/vault tree pairs for the vault-sync.py benchmarks.
+
+Usage:
+    python benchmarks/generate.py /tmp/bench                      # 5000 notes, synced pair
+    python benchmarks/generate.py /tmp/bench --files 50000 --changed 0.05 --conflicting 0.01
+    python benchmarks/generate.py /tmp/bench --cold --attachments 0.1 --noise 3
+
+Lays out ROOT/local (the project folder) and ROOT/vault (its vault project folder) the way
+a firmware project looks after a while: notes under docs/, yearly Report/ folders and
+lessonsLearned/, binary attachments under docs/attachments/, plus build and git noise
+(.pio/, .git/, docs/private/) that sync.include / sync.exclude keep out of the sync.
+A VAULT-BLUEPRINT.md is written too, so `vault-sync.py --once` runs in ROOT/local.
+
+Note sizes follow a log-normal distribution around --median-size; --attachments of the
+files are attachments around --attachment-size instead. Without --cold both sides hold the
+same files (with mtimes spread over the past year), so the first reconcile only records the
+baseline; --changed and --conflicting then edit that share of the files on one side or on
+both (from the command line, after recording that baseline in ROOT/local). The same --seed
+always produces the same tree.
+"""
+
+import argparse
+import contextlib
+import math
+import os
+import random
+import threading
+import time
+import zlib
+from pathlib import Path
+
+INCLUDE = ["docs/", "Report/", "lessonsLearned/", "CLAUDE.md"]
+EXCLUDE = ["docs/private/", "*.obsidian-*.md", ".vault-sync-state.json"]
+
+MIN_SIZE = 64
+MAX_SIZE = 256 * 2**20
+
+
+def rules() -> dict:
+    """INCLUDE / EXCLUDE as load_blueprint() hands them to the engine."""
+    return {"include": [p.strip("/") for p in INCLUDE], "exclude": [p.strip("/") for p in EXCLUDE]}
+
+
+def _sizes(rng: random.Random, count: int, median: int, sigma: float = 1.0) -> list:
+    """count log-normal sizes around median bytes, clipped to MIN_SIZE..MAX_SIZE."""
+    mu = math.log(median)
+    if not sigma:
+        return [min(MAX_SIZE, max(MIN_SIZE, median))] * count
+    return [min(MAX_SIZE, max(MIN_SIZE, int(rng.lognormvariate(mu, sigma)))) for _ in range(count)]
+
+
+def _rel_paths(rng: random.Random, files: int, attachments: int, per_dir: int) -> list:
+    """Tracked relative paths: attachments first, then notes spread over the project folders."""
+    rels = [f"docs/attachments/a{i // per_dir:03d}/img-{i:06d}.{('png', 'pdf', 'jpg')[i % 3]}"
+            for i in range(attachments)]
+    for i in range(files - attachments):
+        kind = rng.random()
+        if kind < 0.6:
+            rels.append(f"docs/d{i // per_dir:04d}/note-{i:06d}.md")
+        elif kind < 0.9:
+            rels.append(f"Report/{2015 + i % 10}/r{i // per_dir:04d}/report-{i:06d}.md")
+        else:
+            rels.append(f"lessonsLearned/l{i // per_dir:04d}/lesson-{i:06d}.md")
+    return rels
+
+
+def _noise_paths(files: int, noise: float) -> list:
+    """Untracked files: PlatformIO build output, git objects and a few private notes."""
+    count = int(files * noise)
+    rels  = []
+    for i in range(count):
+        kind = i % 10
+        if kind < 5:
+            rels.append(f".pio/build/env{i % 3}/src/obj{i // 1000:03d}/unit-{i:06d}.o")
+        elif kind < 9:
+            rels.append(f".git/objects/{i % 256:02x}/{i:038x}")
+        else:
+            rels.append(f"docs/private/p{i // 1000:03d}/private-{i:06d}.md")
+    return rels
+
+
+def tree_paths(files: int = 5000, attachments: float = 0.01, noise: float = 1.0,
+               per_dir: int = 200, seed: int = 0) -> tuple:
+    """(tracked, noise) relative paths of the tree generate() builds, without writing anything."""
+    n_att = min(files, int(files * attachments))
+    return _rel_paths(random.Random(seed), files, n_att, per_dir), _noise_paths(files, noise)
+
+
+class Payload:
+    """Unique file content sliced from one random pool, so writing is not bound by os.urandom()."""
+
+    def __init__(self, rng: random.Random, pool_size: int = 4 * 2**20):
+        self.pool = rng.randbytes(pool_size)
+
+    def make(self, tag: str, size: int) -> bytes:
+        head = f"{tag}\n".encode()
+        body = size - len(head)
+        if body <= len(self.pool):
+            start = zlib.crc32(tag.encode()) % (len(self.pool) - body + 1)
+            return head + self.pool[start:start + body]
+        reps = body // len(self.pool) + 1
+        return head + (self.pool * reps)[:body]
+
+
+def _write(path: Path, data: bytes, mtime: float | None = None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def generate(root: Path, files: int = 5000, median_size: int = 4096, attachments: float = 0.01,
+             attachment_size: int = 512 * 2**10, noise: float = 1.0, per_dir: int = 200,
+             cold: bool = False, seed: int = 0, sigma: float = 1.0) -> dict:
+    """
+    Build ROOT/local and ROOT/vault and return a cfg dict for reconcile(), plus "rel_paths"
+    (tracked files), "noise_paths" (untracked local files) and "bytes" (total tracked size).
+    sigma is the spread of the log-normal sizes; 0 makes every file its median size.
+    """
+    rng        = random.Random(seed)
+    payload    = Payload(rng)
+    local      = root / "local"
+    vault      = root / "vault"
+    n_att      = min(files, int(files * attachments))
+    rels, noise_rels = tree_paths(files, attachments, noise, per_dir, seed)
+    sizes      = _sizes(rng, n_att, attachment_size, sigma) + _sizes(rng, files - n_att, median_size, sigma)
+    now     = time.time()
+
+    (local / "CLAUDE.md").parent.mkdir(parents=True, exist_ok=True)
+    vault.mkdir(parents=True, exist_ok=True)
+    for rel, size in zip(rels, sizes):
+        data  = payload.make(rel, size)
+        mtime = now - rng.uniform(60, 365 * 86400)
+        _write(local / rel, data, mtime)
+        if not cold:
+            _write(vault / rel, data, mtime)
+    for rel in noise_rels:
+        _write(local / rel, payload.make(rel, 512), now - 3600)
+    (local / "VAULT-BLUEPRINT.md").write_text(
+        f"---\nvault:\n  root: \"{root.resolve().as_posix()}\"\n  project_path: \"vault\"\n"
+        "sync:\n  include:\n" + "".join(f"    - {p}\n" for p in INCLUDE)
+        + "  exclude:\n" + "".join(f"    - \"{p}\"\n" for p in EXCLUDE) + "---\n")
+
+    return {
+        "local_root":    local,
+        "vault_project": vault,
+        **rules(),
+        "rel_paths":     rels,
+        "noise_paths":   noise_rels,
+        "bytes":         sum(sizes),
+    }
+
+
+def mutate(cfg: dict, changed: float = 0.0, conflicting: float = 0.0, seed: int = 1,
+           side: str | None = None) -> dict:
+    """
+    Edit a share of the tracked files and return {"local": [...], "vault": [...], "both": [...]}.
+
+    changed files are edited on one side — two in three locally and the rest in the vault,
+    or all on `side` if given — and conflicting files on both sides with different content.
+    """
+    rng   = random.Random(seed)
+    rels  = cfg["rel_paths"]
+    picks = rng.sample(rels, min(len(rels), int(len(rels) * changed) + int(len(rels) * conflicting)))
+    n_conflict = min(len(picks), int(len(rels) * conflicting))
+    out = {"local": [], "vault": [], "both": picks[:n_conflict]}
+    for i, rel in enumerate(picks[n_conflict:]):
+        out[side or ("local" if i % 3 else "vault")].append(rel)
+    tag = rng.getrandbits(32)
+    for side, root in (("local", cfg["local_root"]), ("vault", cfg["vault_project"])):
+        for rel in out[side] + out["both"]:
+            with open(root / rel, "ab") as f:
+                f.write(f"\nedit {side} {tag}\n".encode())
+    return out
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """The generator options, shared with suite.py."""
+    parser.add_argument("--files",           type=int,   default=5000,  help="Tracked files (default 5000).")
+    parser.add_argument("--per-dir",         type=int,   default=200,   help="Files per folder (default 200).")
+    parser.add_argument("--median-size",     type=int,   default=4096,  help="Median note size in bytes (default 4096).")
+    parser.add_argument("--attachments",     type=float, default=0.01,  help="Share of files that are attachments (default 0.01).")
+    parser.add_argument("--attachment-size", type=int,   default=512 * 2**10,
+                        help="Median attachment size in bytes (default 512 KiB).")
+    parser.add_argument("--size-sigma",      type=float, default=1.0,   help="Spread of the log-normal sizes (default 1.0).")
+    parser.add_argument("--noise",           type=float, default=1.0,   help="Untracked .pio/.git/private files per tracked file (default 1.0).")
+    parser.add_argument("--changed",         type=float, default=0.0,   help="Share of files edited on one side (default 0).")
+    parser.add_argument("--conflicting",     type=float, default=0.0,   help="Share of files edited on both sides (default 0).")
+    parser.add_argument("--cold",            action="store_true",       help="Leave the vault empty (first sync).")
+    parser.add_argument("--seed",            type=int,   default=0,     help="Random seed (default 0).")
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("root", type=Path, help="Folder to create local/ and vault/ in.")
+    add_arguments(parser)
+    args = parser.parse_args()
+    if args.cold and (args.changed or args.conflicting):
+        parser.error("--changed / --conflicting edit a synced pair; they cannot be combined with --cold")
+
+    cfg = generate(args.root, args.files, args.median_size, args.attachments, args.attachment_size,
+                   args.noise, args.per_dir, args.cold, args.seed, args.size_sigma)
+    if args.changed or args.conflicting:
+        # Record the baseline first, so the edits show up as edits rather than as conflicts
+        from common import load_vault_sync
+        vs    = load_vault_sync()
+        state = vs.load_state(cfg["local_root"])
+        lock  = threading.Lock()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            vs.reconcile(cfg, state, lock)
+        vs.save_state(state, lock)
+    edits = mutate(cfg, args.changed, args.conflicting, args.seed + 1)
+    print(f"tracked          : {len(cfg['rel_paths'])} file(s), {cfg['bytes'] / 2**20:.1f} MB")
+    print(f"noise            : {len(cfg['noise_paths'])} file(s)")
+    print(f"edited           : {len(edits['local'])} local, {len(edits['vault'])} vault, "
+          f"{len(edits['both'])} both")
+    print(f"run              : cd {cfg['local_root']} && python vault-sync.py --once")
+
+
+if __name__ == "__main__":
+    main()
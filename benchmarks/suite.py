@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+suite.py — The vault-sync.py benchmark suite: every scenario on a generated project, as JSON.
+
+Usage:
+    python benchmarks/suite.py                                   # all scenarios, 5000 files
+    python benchmarks/suite.py --json results/HEAD.json          # also save the results
+    python benchmarks/suite.py --compare results/base.json       # and show the change against a run
+    python benchmarks/suite.py --scenarios warm_reconcile is_included --files 50000
+    python benchmarks/suite.py --changed 0.1 --conflicting 0.02 --noise 5
+
+Each scenario builds its trees with generate.py (the generator options apply to all of
+them) in a temporary folder and reports the best of --repeat runs:
+
+    cold_reconcile   first sync of the project into an empty vault
+    warm_reconcile   startup pass over the synced project with nothing changed
+    changed_reconcile  startup pass after --changed / --conflicting of the files were edited
+    sync_pair        sync_pair() on single files edited locally, per file
+    is_included      the include/exclude check, per path (tracked and noise paths)
+    save_state       state snapshot write and load_state() of the synced project
+    event_storm      --storm of the files edited at once, fed through the watcher handler,
+                     the debounce scheduler and process_events() until everything is synced
+    large_transfer   --large-files attachments of --large-size: first copy, then re-copy
+                     after a local edit (hashed on the way)
+
+The JSON holds the commit, Python, platform and options next to the numbers, so runs of
+different commits can be compared with --compare. Metric names end in their unit; for
+"_per_s" and "_mb_s" higher is better, for the rest lower. Runs on Linux with only
+vault-sync.py's own requirements installed — no Obsidian needed.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from common import REPO_ROOT, best_of, load_vault_sync
+from generate import add_arguments, generate, mutate, rules, tree_paths
+
+vs = load_vault_sync()
+
+
+@contextlib.contextmanager
+def quiet():
+    """Send the sync log to os.devnull, so flush cost is measured without filling the terminal."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def build(tmp: Path, args, **overrides) -> dict:
+    options = {"files": args.files, "median_size": args.median_size, "attachments": args.attachments,
+               "attachment_size": args.attachment_size, "noise": args.noise, "per_dir": args.per_dir,
+               "seed": args.seed, "sigma": args.size_sigma}
+    options.update(overrides)
+    return generate(tmp, **options)
+
+
+def synced(tmp: Path, args, **overrides) -> tuple:
+    """A generated project whose baseline is already recorded: (cfg, state, lock)."""
+    cfg   = build(tmp, args, **overrides)
+    state = vs.load_state(tmp)
+    lock  = threading.Lock()
+    with quiet():
+        vs.reconcile(cfg, state, lock, jobs=args.jobs)
+    vs.save_state(state, lock)
+    return cfg, state, lock
+
+
+def fresh_vault(cfg: dict, tmp: Path) -> tuple:
+    """Empty the vault and forget the state, for another first sync."""
+    shutil.rmtree(cfg["vault_project"])
+    cfg["vault_project"].mkdir()
+    for name in (vs.STATE_FILE, vs.STATE_JOURNAL):
+        (tmp / name).unlink(missing_ok=True)
+    return vs.load_state(tmp), threading.Lock()
+
+
+# ── Scenarios ─────────────────────────────────────────────────────────────────
+
+def cold_reconcile(tmp: Path, args) -> dict:
+    cfg  = build(tmp, args, cold=True)
+    best = float("inf")
+    for _ in range(args.repeat):
+        state, lock = fresh_vault(cfg, tmp)
+        with quiet():
+            t0 = time.perf_counter()
+            vs.reconcile(cfg, state, lock, jobs=args.jobs)
+            vs.save_state(state, lock)
+            best = min(best, time.perf_counter() - t0)
+    return {"files": len(cfg["rel_paths"]), "mb": cfg["bytes"] / 2**20, "time_s": best,
+            "files_per_s": len(cfg["rel_paths"]) / best, "copy_mb_s": cfg["bytes"] / 2**20 / best}
+
+
+def warm_reconcile(tmp: Path, args) -> dict:
+    cfg, state, lock = synced(tmp, args)
+    with quiet():
+        best = best_of(lambda: vs.reconcile(cfg, state, lock, jobs=args.jobs), args.repeat)
+    return {"files": len(cfg["rel_paths"]), "time_s": best, "files_per_s": len(cfg["rel_paths"]) / best}
+
+
+def changed_reconcile(tmp: Path, args) -> dict:
+    cfg, state, lock = synced(tmp, args)
+    best, edits = float("inf"), {}
+    for n in range(args.repeat):
+        edits = mutate(cfg, args.changed, args.conflicting, seed=args.seed + 1 + n)
+        with quiet():
+            t0 = time.perf_counter()
+            vs.reconcile(cfg, state, lock, jobs=args.jobs)
+            best = min(best, time.perf_counter() - t0)
+    edited = len(edits["local"]) + len(edits["vault"]) + len(edits["both"])
+    return {"files": len(cfg["rel_paths"]), "edited": edited, "conflicting": len(edits["both"]),
+            "time_s": best, "ms_per_edit": best * 1000 / edited if edited else 0.0}
+
+
+def sync_pair(tmp: Path, args) -> dict:
+    cfg, state, lock = synced(tmp, args, attachments=0.0)
+    local, vault = cfg["local_root"], cfg["vault_project"]
+    best = float("inf")
+    for n in range(args.repeat):
+        rels = mutate(cfg, max(args.changed, 0.01), seed=args.seed + 1 + n, side="local")["local"]
+        with quiet():
+            t0 = time.perf_counter()
+            for rel in rels:
+                vs.sync_pair(local / rel, vault / rel, rel, state, lock)
+            best = min(best, (time.perf_counter() - t0) / max(1, len(rels)))
+    vs.save_state(state, lock)
+    return {"us_per_file": best * 1e6}
+
+
+def is_included(tmp: Path, args) -> dict:
+    cfg     = rules()
+    tracked, noise = tree_paths(args.files, args.attachments, args.noise, args.per_dir, args.seed)
+    paths   = [Path(p) for p in tracked + noise]
+    vs.is_included(paths[0], cfg)   # compile the matcher outside the timing
+    best    = best_of(lambda: [vs.is_included(p, cfg) for p in paths], args.repeat)
+    return {"paths": len(paths), "ns_per_path": best * 1e9 / len(paths)}
+
+
+def save_state(tmp: Path, args) -> dict:
+    _, state, lock = synced(tmp, args)
+    save = best_of(lambda: vs.save_state(state, lock), args.repeat)
+    with quiet():
+        load = best_of(lambda: vs.load_state(tmp), args.repeat)
+    return {"entries": len(state), "save_ms": save * 1000, "load_ms": load * 1000,
+            "snapshot_kb": (tmp / vs.STATE_FILE).stat().st_size / 1024}
+
+
+def event_storm(tmp: Path, args) -> dict:
+    from watchdog.events import FileModifiedEvent
+    cfg, state, lock = synced(tmp, args)
+    projects  = {"bench": (cfg, state, lock)}
+    scheduler = vs.DebounceScheduler(on_batch=lambda keys: vs.dispatch_events(projects, keys))
+    handler   = vs.SyncHandler({cfg["local_root"]: "bench"}, args.storm_debounce, "local", scheduler)
+    scheduler.start()
+    # Local watches cover the include roots only, so of the noise just docs/private/ is seen
+    noise = [p for p in cfg["noise_paths"] if p.startswith("docs/")]
+    best  = None
+    try:
+        for n in range(args.repeat):
+            rels   = mutate(cfg, args.storm, seed=args.seed + 1 + n, side="local")["local"]
+            events = [FileModifiedEvent(str(cfg["local_root"] / rel))
+                      for rel in rels + noise[:len(rels)] for _ in range(3)]   # an editor save is ~3 events
+            batches = scheduler.batches
+            with quiet():
+                t0 = time.perf_counter()
+                for event in events:
+                    handler.dispatch(event)
+                intake = time.perf_counter() - t0
+                while scheduler.depth():
+                    time.sleep(0.001)
+                scheduler.call(lambda: None).result()
+                settle = time.perf_counter() - t0
+            run = {"events": len(events), "edited": len(rels), "batches": scheduler.batches - batches,
+                   "intake_events_per_s": len(events) / intake, "settle_s": settle,
+                   "synced_files_per_s": len(rels) / settle}
+            if best is None or run["settle_s"] < best["settle_s"]:
+                best = run
+    finally:
+        scheduler.stop()
+    vs.save_state(state, lock)
+    return best
+
+
+def large_transfer(tmp: Path, args) -> dict:
+    cfg = build(tmp, args, files=args.large_files, attachments=1.0, attachment_size=args.large_size,
+                noise=0.0, sigma=0.0, cold=True)
+    mb  = cfg["bytes"] / 2**20
+    first = float("inf")
+    for _ in range(args.repeat):
+        state, lock = fresh_vault(cfg, tmp)
+        with quiet():
+            t0 = time.perf_counter()
+            vs.reconcile(cfg, state, lock, jobs=args.jobs)
+            first = min(first, time.perf_counter() - t0)
+    recopy = float("inf")
+    for n in range(args.repeat):
+        mutate(cfg, 1.0, seed=args.seed + 1 + n, side="local")
+        with quiet():
+            t0 = time.perf_counter()
+            vs.reconcile(cfg, state, lock, jobs=args.jobs)
+            recopy = min(recopy, time.perf_counter() - t0)
+    return {"files": args.large_files, "mb": mb, "first_copy_s": first, "first_copy_mb_s": mb / first,
+            "recopy_s": recopy, "recopy_mb_s": mb / recopy}
+
+
+SCENARIOS = {
+    "cold_reconcile":    cold_reconcile,
+    "warm_reconcile":    warm_reconcile,
+    "changed_reconcile": changed_reconcile,
+    "sync_pair":         sync_pair,
+    "is_included":       is_included,
+    "save_state":        save_state,
+    "event_storm":       event_storm,
+    "large_transfer":    large_transfer,
+}
+
+
+# ── Reporting ─────────────────────────────────────────────────────────────────
+
+def environment() -> dict:
+    def git(*cmd):
+        try:
+            return subprocess.run(["git", *cmd], cwd=REPO_ROOT, capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    return {
+        "commit":   git("describe", "--always", "--dirty"),
+        "subject":  git("log", "-1", "--format=%s"),
+        "date":     datetime.now().isoformat(timespec="seconds"),
+        "python":   platform.python_version(),
+        "platform": platform.platform(),
+        "cpus":     os.cpu_count(),
+        "hashes":   [name for name in vs.HASH_ALGORITHMS if vs.hash_available(name)],
+    }
+
+
+def higher_is_better(metric: str) -> bool:
+    return metric.endswith(("_per_s", "_mb_s"))
+
+
+def print_results(results: dict, base: dict | None = None):
+    base_scenarios = (base or {}).get("scenarios", {})
+    if base:
+        print(f"compared with    : {base['environment'].get('commit')} ({base['environment'].get('date')})")
+    for scenario, values in results["scenarios"].items():
+        print(f"{scenario}")
+        for metric, value in values.items():
+            line = f"  {metric:27s}: {value:12.3f}" if isinstance(value, float) else f"  {metric:27s}: {value:8d}"
+            old  = base_scenarios.get(scenario, {}).get(metric)
+            if isinstance(value, float) and old:
+                change = (value - old) / old * 100
+                better = (change > 0) == higher_is_better(metric)
+                line  += f"   {old:12.3f}  {change:+7.1f}%" + ("" if abs(change) < 5 else "  better" if better else "  WORSE")
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS),
+                        metavar="NAME", help="Scenarios to run (default: all).")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario; the best counts (default 3).")
+    parser.add_argument("--jobs", type=int, default=vs.DEFAULT_JOBS,
+                        help=f"Hash/copy workers (default {vs.DEFAULT_JOBS}).")
+    parser.add_argument("--storm", type=float, default=0.2,
+                        help="event_storm: share of the files edited at once (default 0.2).")
+    parser.add_argument("--storm-debounce", type=float, default=0.05,
+                        help="event_storm: debounce delay in seconds (default 0.05).")
+    parser.add_argument("--large-files", type=int, default=4, help="large_transfer: attachments (default 4).")
+    parser.add_argument("--large-size", type=int, default=64 * 2**20,
+                        help="large_transfer: bytes per attachment (default 64 MiB).")
+    parser.add_argument("--json", type=Path, metavar="PATH", help="Write the results to PATH as JSON.")
+    parser.add_argument("--compare", type=Path, metavar="PATH", help="Show the change against a saved run.")
+    add_arguments(parser)
+    args = parser.parse_args()
+    if args.cold:
+        parser.error("--cold: the scenarios choose cold or synced trees themselves")
+
+    base = json.loads(args.compare.read_text()) if args.compare else None
+    results = {"environment": environment(), "options": {k: v for k, v in vars(args).items()
+                                                         if k not in ("json", "compare", "scenarios")},
+               "scenarios": {}}
+    for name in args.scenarios:
+        print(f"running {name} ...", file=sys.stderr, flush=True)
+        with tempfile.TemporaryDirectory(prefix=f"vault-sync-bench-{name}-") as tmp:
+            results["scenarios"][name] = SCENARIOS[name](Path(tmp), args)
+
+    print_results(results, base)
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"results          : {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+test_conflicts.py — Regression tests for vault-sync.py's conflict handling.
+
+Run with: python -m pytest tests/
+"""
+
+import importlib.util
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_vault_sync():
+    """Import vault-sync.py (hyphenated, so not importable by name) from the repository root."""
+    if "vault_sync" in sys.modules:
+        return sys.modules["vault_sync"]
+    spec = importlib.util.spec_from_file_location("vault_sync", REPO_ROOT / "vault-sync.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["vault_sync"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+vs = load_vault_sync()
+
+
+@pytest.fixture
+def pair(tmp_path):
+    """A local and a vault copy of notes.md, synced to the same baseline."""
+    local, vault = tmp_path / "local", tmp_path / "vault"
+    local.mkdir()
+    vault.mkdir()
+    (local / "notes.md").write_text("base\n")
+    (vault / "notes.md").write_text("base\n")
+    state, lock = vs.SyncState(tmp_path), threading.Lock()
+
+    def sync():
+        return vs.sync_pair(local / "notes.md", vault / "notes.md", "notes.md", state, lock)[0]
+
+    sync()
+    return local, vault, state, sync
+
+
+def backups(local: Path) -> list:
+    return sorted(p.read_text() for p in local.glob("notes.obsidian-*.md"))
+
+
+def test_conflict_keeps_local_and_backs_up_vault(pair):
+    local, vault, state, sync = pair
+    (local / "notes.md").write_text("local edit\n")
+    (vault / "notes.md").write_text("vault edit\n")
+    assert sync() == "conflict"
+    assert (local / "notes.md").read_text() == "local edit\n"
+    assert backups(local) == ["vault edit\n"]
+    assert "notes.md" in state.conflicts
+
+
+def test_second_vault_edit_preserves_local(pair):
+    local, vault, state, sync = pair
+    (local / "notes.md").write_text("local edit\n")
+    (vault / "notes.md").write_text("vault edit\n")
+    assert sync() == "conflict"
+    (vault / "notes.md").write_text("vault edit 2\n")
+    assert sync() == "conflict"
+    assert (local / "notes.md").read_text() == "local edit\n"
+    assert backups(local) == ["vault edit\n", "vault edit 2\n"]
+    assert "notes.md" in state.conflicts
+
+
+def test_local_merge_resolves(pair):
+    local, vault, state, sync = pair
+    (local / "notes.md").write_text("local edit\n")
+    (vault / "notes.md").write_text("vault edit\n")
+    assert sync() == "conflict"
+    (local / "notes.md").write_text("merged\n")
+    assert sync() == "to_vault"
+    assert (vault / "notes.md").read_text() == "merged\n"
+    assert "notes.md" not in state.conflicts
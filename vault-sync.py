@@ -3,90 +3,688 @@
 vault-sync.py — Two-way sync between a local firmware project and its Obsidian vault mirror.
 
 Usage:
-    python vault-sync.py          # continuous mode — watches both directories
-    python vault-sync.py --once   # one-shot reconciliation, then exit
+    python vault-sync.py                   # continuous mode — watches both directories
+    python vault-sync.py --once            # one-shot reconciliation, then exit
+    python vault-sync.py --once --verify   # re-hash every file instead of trusting stat signatures
+    python vault-sync.py --once --jobs 4   # limit reconciliation to 4 hash/copy worker threads
+    python vault-sync.py --once --full     # re-list every folder instead of trusting the directory index
+    python vault-sync.py --once docs       # reconcile only these files or folders
+    python vault-sync.py --sync docs/FSD.md   # sync these files now
+    python vault-sync.py --status          # queue, counters and conflicts of the running instance
+    python vault-sync.py --flush           # make the running instance write its state file
+    python vault-sync.py --conflicts       # list unresolved conflicts and their backup files
+    python vault-sync.py --once -q         # only the pass summary, conflicts and errors (-v: every file)
+    python vault-sync.py --log-file sync.jsonl   # also append every log line as JSON
+    python vault-sync.py --stats-file      # also write sync metrics to .vault-sync-stats.json
+    python vault-sync.py --metrics-port 9477  # also serve them for Prometheus at /metrics
+    python vault-sync.py --once --profile  # time each phase (walk, hashing, copies, state writes)
+    python vault-sync.py --profile-out trace.json   # ...and write a Chrome trace of the event path
+    python vault-sync.py --discover C:\Desktop\Projects   # daemon: every project below, one process
 
 Run from the project root directory (where VAULT-BLUEPRINT.md lives).
 
 How it works:
-  - Reads vault.root and vault.project_path from VAULT-BLUEPRINT.md
-  - Maintains .vault-sync-state.json as the trusted checksum baseline
-  - On startup: reconciles all tracked files using three-way logic
-  - In continuous mode: watches local (2s debounce) and vault (5s debounce)
+  - Reads vault.root and vault.project_path from VAULT-BLUEPRINT.md, and caches the parsed
+    settings in .vault-sync-blueprint.json until the blueprint changes
+  - Maintains .vault-sync-state.json as the trusted checksum baseline, with per-file
+    changes appended to .vault-sync-state.journal and compacted atomically
+  - Records each side's stat signature (size, mtime_ns, inode) so unchanged files are not re-hashed
+  - On startup: reconciles all tracked files using three-way logic, syncing each file as soon as
+    the walk of both sides reaches it — most recently edited files first
+  - In continuous mode: watches the local include roots (2s debounce) and vault (5s debounce)
   - Three-way logic: local changed → copy to vault | vault changed → copy to local | both changed → conflict backup
-  - Conflicts: vault version saved as {file}.obsidian-{YYYYMMDD-HHMM}.md, never silently discarded
+  - Conflicts: each vault version saved once as {file}.obsidian-{YYYYMMDD-HHMM}.md, never silently discarded;
+    registered in the state until resolved (--conflicts lists them)
+  - Moves: a file moved on one side is renamed on the other (matched by checksum), not re-copied
   - Lockfile: .vault-sync.lock prevents multiple instances per project
+  - Control socket: .vault-sync.sock (TCP on localhost where UNIX sockets are unavailable) lets
+    --once, --sync, --status and --flush hand their work to the running instance
+  - Daemon mode (--projects / --discover): one process, one observer and one vault watch serve
+    many projects; each keeps its own state file and lockfile
 """
 
 import sys
 import os
 import json
 import hashlib
+import heapq
+import hmac
+import importlib
+import mmap
 import shutil
 import signal
+import stat
 import time
-import fnmatch
 import argparse
+import atexit
+import bisect
+import contextlib
+import functools
+import re
 import threading
 from pathlib import Path
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import MutableMapping
 from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
 
-try:
-    import yaml
-    from watchdog.observers import Observer
-    from watchdog.events import FileSystemEventHandler
-except ImportError as e:
-    print(f"ERROR: Missing dependency: {e}")
-    print("       Run: pip install -r requirements.txt")
-    sys.exit(1)
+# PyYAML and watchdog are imported on first use (require()): --once with a cached blueprint
+# needs neither, and every /sync-vault and editor hook pays for the process start.
 
 # ── Constants ─────────────────────────────────────────────────────────────────
 
 STATE_FILE     = Path(".vault-sync-state.json")
+STATE_JOURNAL  = Path(".vault-sync-state.journal")
+STATE_FORMAT   = 2
+COMPACT_MIN    = 1000  # journal records before compaction is considered
 LOCK_FILE      = Path(".vault-sync.lock")
+CONTROL_FILE   = Path(".vault-sync.sock")   # control endpoint of the running instance
+CONTROL_CONNECT = 2.0  # seconds to wait for the running instance to accept a control request
 BLUEPRINT      = Path("VAULT-BLUEPRINT.md")
+BLUEPRINT_CACHE = Path(".vault-sync-blueprint.json")   # parsed blueprint, valid while the blueprint is unchanged
+BLUEPRINT_FORMAT = 1   # bump when the cached settings change shape
 LOCAL_DEBOUNCE = 2.0   # seconds — absorbs VS Code auto-save bursts
 VAULT_DEBOUNCE = 5.0   # seconds — allows Obsidian Sync to finish writing
+DEBOUNCE_LIMIT = 10000 # debounced paths held at once before falling back to a full pass
+BATCH_COMMIT   = 256   # synced paths per batched journal write
+BATCH_MAX      = 1024  # debounced paths handed to one sync batch
+PRIORITY_WINDOW = 8192 # changed paths reconcile holds back to sync the most recently edited first
+ECHO_TTL       = 30.0  # seconds a write by this process is expected to echo back as events
+ECHO_LIMIT     = 65536 # expected echoes held at once; the oldest are forgotten first
+DEFAULT_JOBS   = min(8, os.cpu_count() or 1)   # reconcile hash/copy workers; raise for slow network vaults
+HASH_CHUNK     = 1 << 20    # bytes per read when streaming a file through the hasher
+MMAP_THRESHOLD = 64 << 20   # files this large are hashed through mmap (POSIX only)
+TMP_SUFFIX     = ".vault-sync-tmp"   # in-flight transfer files, never synced
+FICLONE        = 0x40049409           # Linux ioctl: reflink one file's extents into another
+RACY_WINDOW_NS = 2_000_000_000   # files modified this recently are always hashed (FAT mtime is 2 s)
+STATS_FILE     = Path(".vault-sync-stats.json")
+STATS_INTERVAL = 10.0  # seconds between stats file writes
+LATENCY_BUCKETS = (0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 300.0)   # seconds, event-to-sync histogram
+DIGEST_SLOT    = 32    # bytes reserved per state entry for its raw digest (sha256/blake2b; xxh3 uses 16)
 
 
 # ── Logging ──────────────────────────────────────────────────────────────────
 
-def log(tag: str, message: str):
-    ts = datetime.now().strftime("%H:%M:%S")
-    tag_fmt = tag.upper().ljust(8)
-    print(f"[{ts}] [{tag_fmt}] {message}", flush=True)
+LOG_LEVELS     = {"debug": 10, "info": 20, "summary": 25, "warning": 30, "error": 40}
+TAG_LEVELS     = {"skip": "debug", "conflict": "warning", "error": "error"}   # every other tag is info
+LOG_BUFFER     = 256   # lines held before they are written out
+LOG_INTERVAL   = 1.0   # seconds a buffered line may wait for the next log call to write it
+
+_log_taps: list = []   # (level, lines) of control requests in progress: their lines at level and above
+
+
+class LogWriter:
+    """
+    Leveled log output: console lines at `level` and above, JSON lines to an optional file.
+
+    Lines logged with flush=False (per-file lines inside a pass) are buffered and written
+    LOG_BUFFER at a time, or once LOG_INTERVAL has passed, instead of one flushed write per
+    line; flush=True writes them and everything before them at once. Skip lines are debug,
+    so a pass over thousands of unchanged files is quiet unless --verbose is given.
+    A "project" field (daemon mode) also prefixes the console line with the project name.
+    """
+
+    def __init__(self):
+        self.level      = LOG_LEVELS["info"]
+        self.file_level = LOG_LEVELS["info"]
+        self.file       = None
+        self._lock      = threading.Lock()
+        self._lines: list   = []
+        self._records: list = []
+        self._since     = 0.0
+
+    def configure(self, level: str = "info", path: Path | None = None):
+        """Set the console level; path opens the JSON-lines log file (appended) — info and above, or debug too."""
+        self.level      = LOG_LEVELS[level]
+        self.file_level = min(self.level, LOG_LEVELS["info"])
+        if path is not None:
+            self.file = open(path, "a", encoding="utf-8")
+
+    def emit(self, tag: str, message: str, flush: bool, fields: dict):
+        key   = tag.lower()
+        name  = key if key in LOG_LEVELS else TAG_LEVELS.get(key, "info")
+        level = LOG_LEVELS[name]
+        to_console = level >= self.level
+        to_file    = self.file is not None and level >= self.file_level
+        taps       = [lines for tap_level, lines in _log_taps if level >= tap_level]
+        if not (to_console or to_file or taps or flush):
+            return
+        now     = datetime.now()
+        project = fields.get("project")
+        if project is None:
+            fields.pop("project", None)
+        with self._lock:
+            line = f"[{now:%H:%M:%S}] [{tag.upper().ljust(8)}] {f'{project}: ' if project else ''}{message}"
+            if to_console:
+                self._lines.append(line)
+            for lines in taps:
+                lines.append(line)
+            if to_file:
+                self._records.append(json.dumps({"time": now.isoformat(timespec="milliseconds"),
+                                                 "level": name, "tag": key,
+                                                 "message": message, **fields}, ensure_ascii=False))
+            if not self._since:
+                self._since = time.monotonic()
+            if (flush or level >= LOG_LEVELS["warning"] or len(self._lines) >= LOG_BUFFER
+                    or len(self._records) >= LOG_BUFFER or time.monotonic() - self._since >= LOG_INTERVAL):
+                self._write()
+
+    def flush(self):
+        with self._lock:
+            self._write()
+
+    def _write(self):
+        # One write per batch, so lines from worker threads never interleave
+        if self._lines:
+            sys.stdout.write("\n".join(self._lines) + "\n")
+            self._lines.clear()
+        sys.stdout.flush()
+        if self._records:
+            try:
+                self.file.write("\n".join(self._records) + "\n")
+                self.file.flush()
+            except (OSError, ValueError):
+                pass   # A full disk or closed file must not stop the sync
+            self._records.clear()
+        self._since = 0.0
+
+
+log_writer = LogWriter()
+
+
+def log(tag: str, message: str, flush: bool = True, **fields):
+    """Log one line; fields are extra keys for the JSON-lines log file (path, bytes, counts)."""
+    log_writer.emit(tag, message, flush, fields)
 
 
 def ts_suffix() -> str:
     return datetime.now().strftime("%Y%m%d-%H%M")
 
 
+def require(module: str):
+    """Import a dependency from requirements.txt on first use, or exit with the install hint."""
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        print(f"ERROR: Missing dependency: {e}")
+        print("       Run: pip install -r requirements.txt")
+        sys.exit(1)
+
+
+# ── Metrics ───────────────────────────────────────────────────────────────────
+
+METRIC_HELP = {
+    "vault_sync_events_total":            ("counter",   "Watcher events, by side and outcome (delivered, queued, unrouted)"),
+    "vault_sync_queue_depth":             ("gauge",     "Paths waiting for their debounce deadline"),
+    "vault_sync_batches_total":           ("counter",   "Debounced batches synced"),
+    "vault_sync_events_dropped_total":    ("counter",   "Events dropped because the debounce queue was full"),
+    "vault_sync_files_synced_total":      ("counter",   "Files copied, by source side"),
+    "vault_sync_hash_bytes_total":        ("counter",   "Bytes hashed without copying, by side"),
+    "vault_sync_hash_seconds_total":      ("counter",   "Time spent hashing without copying, by side"),
+    "vault_sync_copy_bytes_total":        ("counter",   "Bytes copied (hashed on the way where needed), by source side"),
+    "vault_sync_copy_seconds_total":      ("counter",   "Time spent copying, by source side"),
+    "vault_sync_state_save_seconds":      ("histogram", "Time to write a state snapshot"),
+    "vault_sync_conflicts_total":         ("counter",   "Conflicts detected"),
+    "vault_sync_conflicts_open":          ("gauge",     "Unresolved conflicts"),
+    "vault_sync_echo_suppressed_total":   ("counter",   "Events recognized as this process's own writes and dropped"),
+    "vault_sync_event_latency_seconds":   ("histogram", "First watcher event to end of its sync batch"),
+}
+
+
+class Metrics:
+    """
+    Process-wide counters and histograms, plus gauges read from their owners on demand.
+
+    Disabled (the default) every inc()/observe() returns on its first line, and call sites
+    that time something check metrics.enabled before reading the clock, so the engine pays
+    one attribute load per file. Enabled, snapshot() feeds the JSON stats file and
+    prometheus() the /metrics endpoint.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.started = time.time()
+        self._lock   = threading.Lock()
+        self._values: dict = {}   # (name, labels) → float
+        self._hists: dict = {}    # (name, labels) → [bucket counts..., +Inf count, sum]
+        self._gauges: list = []   # () → [(name, labels dict, value)]
+
+    def inc(self, name: str, value: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def observe(self, name: str, value: float, buckets: tuple = LATENCY_BUCKETS, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            hist = self._hists.get(key)
+            if hist is None:
+                hist = self._hists[key] = [buckets] + [0] * (len(buckets) + 1) + [0.0]
+            hist[1 + bisect.bisect_left(buckets, value)] += 1
+            hist[-1] += value
+
+    def gauge(self, read):
+        """Register read() → [(name, labels, value)], called on every snapshot."""
+        self._gauges.append(read)
+
+    def samples(self) -> tuple:
+        """([(name, labels, value)] for counters and gauges, [(name, labels, buckets, counts, sum)])."""
+        with self._lock:
+            values = [(name, dict(labels), value) for (name, labels), value in self._values.items()]
+            hists  = [(name, dict(labels), h[0], h[1:-1], h[-1]) for (name, labels), h in self._hists.items()]
+        for read in self._gauges:
+            values.extend(read())
+        return sorted(values, key=lambda v: (v[0], sorted(v[1].items()))), sorted(hists, key=lambda h: h[0])
+
+    def snapshot(self) -> dict:
+        values, hists = self.samples()
+        out = {"time": datetime.now().isoformat(timespec="seconds"), "pid": os.getpid(),
+               "uptime_s": round(time.time() - self.started, 1), "metrics": {}}
+        for name, labels, value in values:
+            label = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+            if label:
+                out["metrics"].setdefault(name, {})[label] = value
+            else:
+                out["metrics"][name] = value
+        for name, labels, buckets, counts, total in hists:
+            label = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+            entry = {"count": sum(counts), "sum": round(total, 6),
+                     "buckets": {str(le): n for le, n in zip((*buckets, "+Inf"), counts)}}
+            if label:
+                out["metrics"].setdefault(name, {})[label] = entry
+            else:
+                out["metrics"][name] = entry
+        return out
+
+    def prometheus(self) -> str:
+        """All samples in the Prometheus text exposition format (version 0.0.4)."""
+        values, hists = self.samples()
+        lines, described = [], set()
+
+        def describe(name: str):
+            if name not in described and name in METRIC_HELP:
+                kind, text = METRIC_HELP[name]
+                lines.extend((f"# HELP {name} {text}", f"# TYPE {name} {kind}"))
+            described.add(name)
+
+        def fmt(labels: dict) -> str:
+            if not labels:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in sorted(labels.items())) + "}"
+
+        for name, labels, value in values:
+            describe(name)
+            lines.append(f"{name}{fmt(labels)} {value}")
+        for name, labels, buckets, counts, total in hists:
+            describe(name)
+            running = 0
+            for le, n in zip((*buckets, "+Inf"), counts):
+                running += n
+                lines.append(f"{name}_bucket{fmt({**labels, 'le': le})} {running}")
+            lines.append(f"{name}_sum{fmt(labels)} {total}")
+            lines.append(f"{name}_count{fmt(labels)} {running}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+class StatsWriter:
+    """Writes metrics.snapshot() to a JSON file every `interval` seconds, and once more on stop()."""
+
+    def __init__(self, path: Path, interval: float = STATS_INTERVAL):
+        self.path     = path
+        self.interval = interval
+        self._stop    = threading.Event()
+        self._thread  = threading.Thread(target=self._run, name="vault-sync-stats", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.write()
+
+    def write(self):
+        try:
+            _atomic_write(self.path, json.dumps(metrics.snapshot(), indent=2) + "\n")
+        except OSError as e:
+            log("error", f"Could not write stats file {self.path}: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+
+def serve_metrics(port: int):
+    """Serve metrics.prometheus() at http://127.0.0.1:port/metrics and return the server."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = metrics.prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass   # Scrapes are not worth a log line
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, name="vault-sync-metrics", daemon=True).start()
+    return server
+
+
+# ── Profiling ─────────────────────────────────────────────────────────────────
+
+PROFILE_PHASES = ("blueprint", "state load", "walk", "filter", "hash (local)", "hash (vault)",
+                  "moves", "decide", "copy", "persist")
+HASH_PHASES    = {"local": "hash (local)", "vault": "hash (vault)"}
+TRACE_LIMIT    = 500_000   # Trace events kept in memory; later ones are counted, not recorded
+
+
+class _Span:
+    """One timed block on one thread. Time spent in spans nested inside it is subtracted."""
+
+    __slots__ = ("profiler", "name", "detail", "phase", "wall", "cpu", "child_wall", "child_cpu")
+
+    def __init__(self, profiler: "Profiler", name: str, detail, phase: bool):
+        self.profiler = profiler
+        self.name     = name
+        self.detail   = detail
+        self.phase    = phase
+
+    def __enter__(self):
+        self.profiler._stack().append(self)
+        self.child_wall = self.child_cpu = 0.0
+        self.cpu  = time.thread_time()
+        self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.wall
+        cpu  = time.thread_time() - self.cpu
+        self.profiler._finish(self, wall, cpu)
+        return False
+
+
+class Profiler:
+    """
+    Wall and CPU time per sync phase (--profile), with an optional trace or cProfile dump.
+
+    span(phase) times a block on the current thread. Times are exclusive — a file hashed
+    while deciding counts as hashing, not deciding — and summed over threads, so with
+    worker threads the phases can add up to more than the elapsed time. A phase whose wall
+    time is far above its CPU time was waiting on the disk or the network. Disabled (the
+    default), span() and profiled() return a shared no-op context manager.
+    """
+
+    def __init__(self):
+        self.enabled       = False
+        self.out: Path | None = None
+        self.trace: list | None = None   # Chrome trace events, when out ends in .json
+        self.trace_dropped = 0
+        self.cprofile      = None        # cProfile.Profile of the sync thread, for any other out
+        self._lock         = threading.Lock()
+        self._totals: dict = {}          # phase → [calls, wall, cpu]
+        self._threads: dict = {}         # thread id → name, for the trace
+        self._local        = threading.local()
+        self._started      = time.perf_counter()
+        self._cpu_started  = time.process_time()
+
+    def start(self, out: Path | None = None):
+        self.enabled      = True
+        self.out          = out
+        self._started     = time.perf_counter()
+        self._cpu_started = time.process_time()
+        if out is not None and out.suffix.lower() == ".json":
+            self.trace = []
+        elif out is not None:
+            import cProfile
+            self.cprofile = cProfile.Profile()
+
+    def span(self, name: str, detail=None):
+        """Time a block as phase `name`; detail (e.g. the file) is shown in the trace."""
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, name, detail, True)
+
+    def phase(self, name: str):
+        """Decorator: time every call as phase `name`, with a Path first argument as the detail."""
+        def wrap(fn):
+            @functools.wraps(fn)
+            def timed(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Span(self, name, args[0] if args and isinstance(args[0], Path) else None, True):
+                    return fn(*args, **kwargs)
+            return timed
+        return wrap
+
+    def profiled(self, name: str, detail=None):
+        """
+        Mark one unit of sync work (a pass, a debounced batch, a control request) in the trace,
+        and record it in the cProfile dump. Only this thread is profiled by cProfile — hashing
+        and copying on worker threads show up in the phase table, or in the dump with --jobs 1.
+        """
+        if not self.enabled:
+            return _NO_SPAN
+        return self._profiled(name, detail)
+
+    @contextlib.contextmanager
+    def _profiled(self, name: str, detail):
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        if self.cprofile is not None and not depth:
+            self.cprofile.enable()
+        try:
+            with _Span(self, name, detail, False):
+                yield
+        finally:
+            self._local.depth = depth
+            if self.cprofile is not None and not depth:
+                self.cprofile.disable()
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _finish(self, span: _Span, wall: float, cpu: float):
+        stack = self._stack()
+        stack.pop()
+        if stack:
+            stack[-1].child_wall += wall
+            stack[-1].child_cpu  += cpu
+        with self._lock:
+            if span.phase:
+                totals = self._totals.get(span.name)
+                if totals is None:
+                    totals = self._totals[span.name] = [0, 0.0, 0.0]
+                totals[0] += 1
+                totals[1] += wall - span.child_wall
+                totals[2] += cpu - span.child_cpu
+            if self.trace is None or span.name == "filter":
+                return   # Filter checks run per path — the table has their total
+            if len(self.trace) >= TRACE_LIMIT:
+                self.trace_dropped += 1
+                return
+            tid = threading.get_ident()
+            if tid not in self._threads:
+                self._threads[tid] = threading.current_thread().name
+            event = {"name": span.name, "cat": "phase" if span.phase else "sync", "ph": "X",
+                     "ts": round((span.wall - self._started) * 1e6, 1), "dur": round(wall * 1e6, 1),
+                     "pid": os.getpid(), "tid": tid}
+            if span.detail is not None:
+                event["args"] = {"detail": str(span.detail)}
+            self.trace.append(event)
+
+    def report(self) -> list:
+        """The phase table, as lines."""
+        elapsed = time.perf_counter() - self._started
+        cpu     = time.process_time() - self._cpu_started
+        with self._lock:
+            totals = {name: list(t) for name, t in self._totals.items()}
+        order = [p for p in PROFILE_PHASES if p in totals] + sorted(set(totals) - set(PROFILE_PHASES))
+        spent = sum(t[1] for t in totals.values()) or 1.0
+        lines = [f"Profile: {elapsed:.2f}s elapsed, {cpu:.2f}s CPU (all threads)",
+                 f"  {'phase':14s} {'calls':>9s} {'wall s':>9s} {'cpu s':>9s} {'wall %':>7s} {'avg ms':>9s}"]
+        for name in order:
+            calls, wall, cpu = totals[name]
+            lines.append(f"  {name:14s} {calls:9d} {wall:9.3f} {cpu:9.3f} {wall / spent * 100:6.1f}% "
+                         f"{wall / calls * 1000:9.3f}")
+        return lines
+
+    def write(self, path: Path):
+        """Write the trace (Chrome trace-event JSON) or the cProfile dump (pstats) to path."""
+        if self.trace is not None:
+            with self._lock:
+                names  = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+                           "args": {"name": name}} for tid, name in self._threads.items()]
+                events = names + self.trace
+            _atomic_write(path, json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+        elif self.cprofile is not None:
+            self.cprofile.dump_stats(str(path))
+
+    def finish(self):
+        """Print the phase table and write the trace or dump, if one was asked for. Runs at exit."""
+        for line in self.report():
+            print(line)
+        if self.out is None:
+            return
+        try:
+            self.write(self.out)
+        except OSError as e:
+            log("error", f"Could not write profile {self.out}: {e}")
+            return
+        dropped = f" ({self.trace_dropped} event(s) over {TRACE_LIMIT} not recorded)" if self.trace_dropped else ""
+        log("info", f"Profile written to {self.out}{dropped}")
+
+
+_NO_SPAN = contextlib.nullcontext()
+profiler = Profiler()
+
+
 # ── Blueprint parsing ─────────────────────────────────────────────────────────
 
-def load_blueprint() -> dict:
-    """Parse VAULT-BLUEPRINT.md YAML frontmatter and return a config dict."""
-    if not BLUEPRINT.exists():
-        print("ERROR: VAULT-BLUEPRINT.md not found in current directory.")
-        print(f"       Current directory: {Path.cwd()}")
-        print("       Run vault-sync.py from the project root folder.")
-        print("       Example: cd C:\\Desktop\\Projects\\sensor-reading && python vault-sync.py")
-        sys.exit(1)
+def _frontmatter(raw: str) -> str | None:
+    """The YAML between the opening "---" line and the next line that is exactly "---", or None."""
+    lines = raw.lstrip("\ufeff").splitlines()
+    while lines and not lines[0].strip():
+        lines.pop(0)
+    if not lines or lines[0].rstrip() != "---":
+        return None
+    for i in range(1, len(lines)):
+        if lines[i].rstrip() == "---":
+            return "\n".join(lines[1:i])
+    return None
+
 
-    raw = BLUEPRINT.read_text(encoding="utf-8")
-    parts = raw.split("---")
-    if len(parts) < 3:
+def parse_blueprint(raw: str) -> dict:
+    """
+    Parse and validate the blueprint's frontmatter into plain settings (the cached part).
+
+    Checks that depend on this machine rather than on the file — whether the vault folders
+    exist, whether the hash's optional package is installed — are left to load_blueprint().
+    """
+    front = _frontmatter(raw)
+    if front is None:
         print("ERROR: VAULT-BLUEPRINT.md has no valid YAML frontmatter (missing --- delimiters).")
         sys.exit(1)
 
+    yaml = require("yaml")
     try:
-        config = yaml.safe_load(parts[1])
+        config = yaml.safe_load(front)
     except yaml.YAMLError as e:
         print(f"ERROR: Could not parse VAULT-BLUEPRINT.md YAML:\n       {e}")
         sys.exit(1)
 
-    vault_root    = Path(config["vault"]["root"])
-    project_path  = config["vault"]["project_path"]
-    vault_project = vault_root / project_path
+    hash_algo = str(config.get("sync", {}).get("hash", "sha256")).lower()
+    if hash_algo not in HASH_ALGORITHMS:
+        print(f"ERROR: Unknown sync.hash '{hash_algo}' in VAULT-BLUEPRINT.md.")
+        print(f"       Supported: {', '.join(HASH_ALGORITHMS)}")
+        sys.exit(1)
+
+    durability = str(config.get("sync", {}).get("durability", "file")).lower()
+    if durability not in ("off", "file", "full"):
+        print(f"ERROR: Unknown sync.durability '{durability}' in VAULT-BLUEPRINT.md.")
+        print("       Supported: off, file, full")
+        sys.exit(1)
+
+    return {
+        "vault_root":    str(config["vault"]["root"]),
+        "project_path":  str(config["vault"]["project_path"]),
+        "include":       [str(s).rstrip("/") for s in config.get("sync", {}).get("include", [])],
+        "exclude":       [str(e).strip("/") for e in config.get("sync", {}).get("exclude", [])],
+        "hash":          hash_algo,
+        "durability":    durability,
+    }
+
+
+def _blueprint_settings(root: Path, blueprint: Path, st: os.stat_result) -> dict:
+    """
+    The blueprint's settings from BLUEPRINT_CACHE, re-parsed only if the blueprint changed.
+
+    The cache is trusted without reading the blueprint while its stat signature matches;
+    otherwise the blueprint is read and its SHA-256 compared, so a touched but unchanged
+    file (git checkout, copy) still skips YAML. The cache is rewritten whenever either changed.
+    """
+    cache_file = root / BLUEPRINT_CACHE
+    try:
+        cache = json.loads(cache_file.read_text(encoding="utf-8"))
+        if cache.get("format") != BLUEPRINT_FORMAT:
+            cache = None
+    except (OSError, ValueError):
+        cache = None
+
+    sig = trusted_sig(st)
+    if cache is not None and sig is not None and sig_matches(sig, cache.get("sig")):
+        return cache["settings"]
+
+    raw    = blueprint.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    if cache is not None and cache.get("sha256") == digest:
+        settings = cache["settings"]
+    else:
+        settings = parse_blueprint(raw.decode("utf-8"))
+    try:
+        _atomic_write(cache_file, json.dumps({"format": BLUEPRINT_FORMAT, "sig": sig, "sha256": digest,
+                                              "settings": settings}) + "\n")
+    except OSError:
+        pass   # A read-only project folder only costs the YAML parse next time
+    return settings
+
+
+@profiler.phase("blueprint")
+def load_blueprint(root: Path | None = None) -> dict:
+    """Parse root's (default: the current directory's) VAULT-BLUEPRINT.md and return a config dict."""
+    root = root or Path.cwd()
+    blueprint = root / BLUEPRINT
+    try:
+        st = blueprint.stat()
+    except OSError:
+        print("ERROR: VAULT-BLUEPRINT.md not found in project folder.")
+        print(f"       Project folder: {root}")
+        print("       Run vault-sync.py from the project root folder.")
+        print("       Example: cd C:\\Desktop\\Projects\\sensor-reading && python vault-sync.py")
+        sys.exit(1)
+
+    settings      = _blueprint_settings(root, blueprint, st)
+    vault_root    = Path(settings["vault_root"])
+    vault_project = vault_root / settings["project_path"]
 
     if not vault_root.exists():
         print(f"ERROR: Vault root not found: {vault_root}")
@@ -98,215 +696,1882 @@ def load_blueprint() -> dict:
         print("       Run firmware-init.py first, or create the folder manually.")
         sys.exit(1)
 
-    include = [s.rstrip("/") for s in config.get("sync", {}).get("include", [])]
-    exclude = config.get("sync", {}).get("exclude", [])
+    hash_algo = settings["hash"]
+    if not hash_available(hash_algo):
+        log("info", f"sync.hash '{hash_algo}' needs an optional package (pip install xxhash) — using blake2b.")
+        hash_algo = "blake2b"
 
     return {
-        "local_root":    Path.cwd(),
+        "local_root":    root,
+        "vault_root":    vault_root,
         "vault_project": vault_project,
-        "include":       include,
-        "exclude":       [str(e).strip("/") for e in exclude],
+        "include":       settings["include"],
+        "exclude":       settings["exclude"],
+        "matcher":       PathMatcher(settings["include"], settings["exclude"]),
+        "hash":          hash_algo,
+        "durability":    settings["durability"],
     }
 
 
 # ── File filtering ────────────────────────────────────────────────────────────
+#
+# sync.include / sync.exclude rules, compiled once per blueprint into a PathMatcher:
+#   docs           literal — the path itself and everything below it (prefix trie)
+#   *.obsidian-*   glob without "/" — matched against the file name at any depth
+#   docs/**/*.pdf  glob with "/" — matched against the whole path; "**" spans directories,
+#                  and a match on a directory covers everything below it
+#   !pattern       negation — carves an exception out of the other rules in the same list
+# Literal excludes without "/" also match file names at any depth (e.g. CLAUDE.local.md).
+# A path is tracked if an include rule matches it, no negated include matches it, and it is
+# not excluded (an exclude rule matches and no negated exclude does).
+
+GLOB_CHARS      = frozenset("*?[")
+DIR_CACHE_LIMIT = 65536
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a sync glob to a regex body. "*" and "?" stop at "/", "**" does not."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1:end].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            i = end + 1
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
 
-def is_included(rel: Path, cfg: dict) -> bool:
-    """Return True if rel matches the whitelist and does not match the blacklist."""
-    rel_posix = rel.as_posix()
 
-    # Blacklist check first
-    for pattern in cfg["exclude"]:
-        if rel_posix == pattern:
-            return False
-        if rel_posix.startswith(pattern + "/"):
-            return False
-        if fnmatch.fnmatch(rel.name, pattern):
-            return False
+def _literal_prefix(pattern: str) -> str:
+    """Leading path segments of pattern that contain no glob characters."""
+    segments = []
+    for seg in pattern.split("/"):
+        if GLOB_CHARS & set(seg):
+            break
+        segments.append(seg)
+    return "/".join(segments)
+
+
+class _RuleSet:
+    """One signed half of an include or exclude list, compiled for fast matching."""
+
+    __slots__ = ("trie", "file_re", "dir_re", "prefixes")
+
+    def __init__(self, patterns: list, match_names: bool):
+        self.trie     = {}
+        self.prefixes = []   # literal prefix of every rule — "" means it can match anywhere
+        file_parts, dir_parts = [], []
+        name_flag = "(?i:" if os.name == "nt" else "(?:"   # fnmatch on names is case-insensitive on Windows
+
+        for pattern in patterns:
+            if not pattern:
+                continue
+            if GLOB_CHARS & set(pattern):
+                if "/" in pattern:
+                    body = _glob_to_regex(pattern)
+                    file_parts.append(f"{body}(?:/.*)?")
+                    dir_parts.append(f"{body}(?:/.*)?")
+                    self.prefixes.append(_literal_prefix(pattern))
+                else:
+                    file_parts.append(f"(?:.*/)?{name_flag}{_glob_to_regex(pattern)})")
+                    self.prefixes.append("")
+                continue
+            node = self.trie
+            for seg in pattern.split("/"):
+                node = node.setdefault(seg, {})
+            node[None] = True
+            self.prefixes.append(pattern)
+            if match_names and "/" not in pattern:
+                file_parts.append(f"(?:.*/)?{name_flag}{re.escape(pattern)})")
+                self.prefixes[-1] = ""
+
+        self.file_re = re.compile("|".join(file_parts)) if file_parts else None
+        self.dir_re  = re.compile("|".join(dir_parts)) if dir_parts else None
+
+    def _trie_hit(self, rel_posix: str) -> bool:
+        node = self.trie
+        for seg in rel_posix.split("/"):
+            node = node.get(seg)
+            if node is None:
+                return False
+            if None in node:
+                return True
+        return False
 
-    # Whitelist check
-    for pattern in cfg["include"]:
-        if rel_posix == pattern:
+    def matches_file(self, rel_posix: str) -> bool:
+        if self.trie and self._trie_hit(rel_posix):
             return True
-        if rel_posix.startswith(pattern + "/"):
+        return self.file_re is not None and self.file_re.fullmatch(rel_posix) is not None
+
+    def covers_dir(self, dir_posix: str) -> bool:
+        """True if a rule matches dir_posix itself, so it applies to everything below it."""
+        if self.trie and self._trie_hit(dir_posix):
             return True
+        return self.dir_re is not None and self.dir_re.fullmatch(dir_posix) is not None
+
+    def reaches_below(self, dir_posix: str) -> bool:
+        """True if some rule could match a path below dir_posix."""
+        for prefix in self.prefixes:
+            if (not prefix or not dir_posix or prefix == dir_posix
+                    or prefix.startswith(dir_posix + "/") or dir_posix.startswith(prefix + "/")):
+                return True
+        return False
 
-    return False
 
+class PathMatcher:
+    """Compiled sync.include / sync.exclude rules with a per-directory decision cache."""
+
+    def __init__(self, include: list, exclude: list):
+        exclude = list(exclude) + [f"*{TMP_SUFFIX}"]
+        self.include     = _RuleSet([p for p in include if not p.startswith("!")], False)
+        self.include_not = _RuleSet([p[1:] for p in include if p.startswith("!")], False)
+        self.exclude     = _RuleSet([p for p in exclude if not p.startswith("!")], True)
+        self.exclude_not = _RuleSet([p[1:] for p in exclude if p.startswith("!")], True)
+        self._dir_cache: dict[str, bool] = {}
+
+        roots = sorted({_literal_prefix(p) for p in include if not p.startswith("!")})
+        self.roots = [r for r in roots
+                      if not any(o != r and (not o or r.startswith(o + "/")) for o in roots)]
+
+    def dir_excluded(self, dir_posix: str) -> bool:
+        """True if nothing below dir_posix can be tracked. Memoized per directory."""
+        verdict = self._dir_cache.get(dir_posix)
+        if verdict is None:
+            verdict = (
+                (self.exclude.covers_dir(dir_posix)
+                 and not self.exclude_not.reaches_below(dir_posix))
+                or self.include_not.covers_dir(dir_posix)
+                or not (self.include.covers_dir(dir_posix)
+                        or self.include.reaches_below(dir_posix))
+            )
+            if len(self._dir_cache) >= DIR_CACHE_LIMIT:
+                self._dir_cache.clear()
+            self._dir_cache[dir_posix] = verdict
+        return verdict
+
+    def matches(self, rel_posix: str) -> bool:
+        parent = rel_posix.rpartition("/")[0]
+        if parent and self.dir_excluded(parent):
+            return False
+        if self.exclude.matches_file(rel_posix) and not self.exclude_not.matches_file(rel_posix):
+            return False
+        return self.include.matches_file(rel_posix) and not self.include_not.matches_file(rel_posix)
 
-def all_tracked_rel_paths(cfg: dict) -> set:
-    """Return all relative POSIX path strings that are tracked on either side."""
-    rel_paths = set()
-    for root, files in [
-        (cfg["local_root"],    cfg["local_root"].rglob("*")),
-        (cfg["vault_project"], cfg["vault_project"].rglob("*")),
-    ]:
-        for f in files:
-            if not f.is_file():
-                continue
+
+def matcher_for(cfg: dict) -> PathMatcher:
+    """Return the compiled matcher for cfg, compiling it on first use."""
+    matcher = cfg.get("matcher")
+    if matcher is None:
+        matcher = cfg["matcher"] = PathMatcher(cfg["include"], cfg["exclude"])
+    return _ProfiledMatcher(matcher) if profiler.enabled else matcher
+
+
+class _ProfiledMatcher:
+    """A PathMatcher whose checks are timed as the "filter" phase (--profile)."""
+
+    def __init__(self, matcher: PathMatcher):
+        self.matcher = matcher
+        self.roots   = matcher.roots
+
+    def matches(self, rel_posix: str) -> bool:
+        with profiler.span("filter"):
+            return self.matcher.matches(rel_posix)
+
+    def dir_excluded(self, dir_posix: str) -> bool:
+        with profiler.span("filter"):
+            return self.matcher.dir_excluded(dir_posix)
+
+
+def is_included(rel: Path, cfg: dict) -> bool:
+    """Return True if rel matches the whitelist and does not match the blacklist."""
+    return matcher_for(cfg).matches(rel.as_posix())
+
+
+def _list_dir(dir_path: str, dir_rel: str, dir_st: os.stat_result | None, matcher: PathMatcher,
+              cached_index: dict, dir_index: dict | None) -> list:
+    """
+    One folder's tracked files and walkable subfolders as sorted (key, rel_posix, path, st, is_dir).
+
+    Sorting on the name (plus "/" for folders) makes a depth-first walk yield paths in plain
+    string order. With a dir_index, a folder whose signature still matches its cached
+    listing is not listed again — its known entries are stat'ed by name — and every listing
+    taken is recorded in dir_index.
+    """
+    entries = []
+    sig     = trusted_sig(dir_st) if dir_index is not None else None
+    cached  = cached_index.get(dir_rel)
+    if cached is not None and sig is not None and sig_matches(sig, cached[0]):
+        dir_index[dir_rel] = cached
+        for names, is_dir in ((cached[1], False), (cached[2], True)):
+            for name in names:
+                path = os.path.join(dir_path, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if stat.S_ISDIR(st.st_mode) if is_dir else stat.S_ISREG(st.st_mode):
+                    rel_posix = f"{dir_rel}/{name}" if dir_rel else name
+                    entries.append((name + "/" if is_dir else name, rel_posix, path, st, is_dir))
+        entries.sort()
+        return entries
+
+    files, subdirs = [], []
+    try:
+        it = os.scandir(dir_path)
+    except OSError:
+        return entries
+    with it:
+        for entry in it:
+            rel_posix = f"{dir_rel}/{entry.name}" if dir_rel else entry.name
             try:
-                rel = f.relative_to(root)
-                if is_included(rel, cfg):
-                    rel_paths.add(rel.as_posix())
-            except ValueError:
+                if entry.is_dir(follow_symlinks=False):
+                    if not matcher.dir_excluded(rel_posix):
+                        subdirs.append(entry.name)
+                        entries.append((entry.name + "/", rel_posix, entry.path,
+                                        entry.stat() if dir_index is not None else None, True))
+                elif entry.is_file():
+                    if matcher.matches(rel_posix):
+                        files.append(entry.name)
+                        entries.append((entry.name, rel_posix, entry.path, entry.stat(), False))
+            except OSError:
                 continue
-    return rel_paths
+    if sig is not None:
+        dir_index[dir_rel] = [sig, files, subdirs]
+    entries.sort()
+    return entries
+
+
+def _walk_root(root: Path, inc: str, matcher: PathMatcher, cached_index: dict, dir_index: dict | None):
+    """Yield (rel_posix, stat) below one include root, depth-first in sorted order."""
+    start = root / inc if inc else root
+    try:
+        st = start.stat()
+    except OSError:
+        return
+    if not stat.S_ISDIR(st.st_mode):
+        if matcher.matches(inc):
+            yield inc, st
+        return
+    if inc and matcher.dir_excluded(inc):
+        return
+
+    with profiler.span("walk", inc):
+        stack = [iter(_list_dir(str(start), inc, st, matcher, cached_index, dir_index))]
+    while stack:
+        entry = next(stack[-1], None)
+        if entry is None:
+            stack.pop()
+        elif entry[4]:
+            with profiler.span("walk", entry[1]):
+                listing = _list_dir(entry[2], entry[1], entry[3], matcher, cached_index, dir_index)
+            stack.append(iter(listing))
+        else:
+            yield entry[1], entry[3]
+
+
+def walk_side(root: Path, cfg: dict, roots: list | None = None, dir_index: dict | None = None):
+    """
+    Yield (rel_posix, os.stat_result) for every tracked file on one side, sorted by rel_posix.
+
+    The walk starts only from the sync.include roots (or the given subset of relative
+    files and folders) and never descends into directories the matcher rules out, so
+    .pio/, .git/ and build trees are never visited. Stat results come from the os.scandir
+    DirEntry cache — no extra stat per file. Folders are listed one at a time as the walk
+    reaches them, so two sides can be merged on the fly and memory stays bounded by the
+    depth and width of the tree, not its size.
+
+    dir_index, if given, is a {dir_rel: [dir_sig, file_names, subdir_names]} listing cache
+    from an earlier walk and is replaced in place by this walk's. A directory whose stat
+    signature still matches is not listed again: its known files and subdirectories are
+    stat'ed by name instead, since adding, removing or renaming an entry always changes
+    the directory's mtime while editing a file in place does not.
+    """
+    matcher      = matcher_for(cfg)
+    cached_index = dict(dir_index) if dir_index is not None else {}
+    if dir_index is not None:
+        dir_index.clear()
+    walks = [_walk_root(root, inc, matcher, cached_index, dir_index)
+             for inc in (matcher.roots if roots is None else roots)]
+    last = None
+    for rel_posix, st in heapq.merge(*walks, key=lambda item: item[0]):
+        if rel_posix != last:   # Overlapping roots
+            last = rel_posix
+            yield rel_posix, st
+
+
+def scan_side(root: Path, cfg: dict, roots: list | None = None, dir_index: dict | None = None) -> dict:
+    """Walk one side of the sync (see walk_side()) and return {rel_posix: os.stat_result}."""
+    return dict(walk_side(root, cfg, roots, dir_index))
+
+
+def merge_sides(local_walk, vault_walk):
+    """Merge two sorted (rel_posix, stat) streams into (rel_posix, local_st, vault_st); absent is None."""
+    local_walk, vault_walk = iter(local_walk), iter(vault_walk)
+    local = next(local_walk, None)
+    vault = next(vault_walk, None)
+    while local is not None or vault is not None:
+        if vault is None or (local is not None and local[0] < vault[0]):
+            yield local[0], local[1], None
+            local = next(local_walk, None)
+        elif local is None or vault[0] < local[0]:
+            yield vault[0], None, vault[1]
+            vault = next(vault_walk, None)
+        else:
+            yield local[0], local[1], vault[1]
+            local = next(local_walk, None)
+            vault = next(vault_walk, None)
+
+
+def all_tracked_rel_paths(cfg: dict) -> set:
+    """Return all relative POSIX path strings that are tracked on either side."""
+    return (scan_side(cfg["local_root"], cfg).keys()
+            | scan_side(cfg["vault_project"], cfg).keys())
 
 
 # ── Checksums and state ───────────────────────────────────────────────────────
 
-def checksum(path: Path) -> str | None:
-    """SHA-256 hex digest of file contents, or None if file does not exist."""
-    if not path.exists():
+def _xxh3():
+    import xxhash   # Optional: pip install xxhash
+    return xxhash.xxh3_128()
+
+
+HASH_ALGORITHMS = {
+    "sha256":  hashlib.sha256,
+    "blake2b": lambda: hashlib.blake2b(digest_size=32),
+    "xxh3":    _xxh3,   # Non-cryptographic, several times faster than sha256
+}
+
+
+def hash_available(name: str) -> bool:
+    try:
+        HASH_ALGORITHMS[name]()
+        return True
+    except (KeyError, ImportError):
+        return False
+
+
+def file_digests(path: Path, names: list, side: str = "") -> list | None:
+    """
+    Hex digests of path's contents under each algorithm in names, from a single read pass.
+
+    Files are streamed in HASH_CHUNK reads; on POSIX, files of MMAP_THRESHOLD bytes or more
+    are hashed through mmap, so memory stays flat regardless of file size. (mmap is not used
+    on Windows, where a mapped file cannot be replaced by Obsidian or an editor.)
+    Returns None if the file does not exist or cannot be read. side ("local" or "vault")
+    labels the bytes and time in the hash metrics.
+    """
+    t0 = time.perf_counter() if metrics.enabled else 0.0
+    try:
+        hashers = [HASH_ALGORITHMS[name]() for name in names]
+        with profiler.span(HASH_PHASES.get(side, "hash"), path), open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size >= MMAP_THRESHOLD and os.name != "nt":
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for h in hashers:
+                        h.update(mm)
+            else:
+                buf = bytearray(HASH_CHUNK)
+                view = memoryview(buf)
+                while n := f.readinto(buf):
+                    for h in hashers:
+                        h.update(view[:n])
+    except OSError:
         return None
+    if t0:
+        metrics.inc("vault_sync_hash_bytes_total", size, side=side or "other")
+        metrics.inc("vault_sync_hash_seconds_total", time.perf_counter() - t0, side=side or "other")
+    return [h.hexdigest() for h in hashers]
+
+
+def checksum(path: Path, hash_name: str = "sha256", side: str = "") -> str | None:
+    """Hex digest of file contents, or None if file does not exist."""
+    digests = file_digests(path, [hash_name], side)
+    return digests[0] if digests else None
+
+
+def stat_sig(st: os.stat_result) -> list:
+    """Stat signature [size, mtime_ns, inode] used to skip hashing unchanged files."""
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def sig_matches(sig: list, stored: list | None) -> bool:
+    """True if sig equals the stored signature. An inode of 0 (Windows DirEntry) matches any."""
+    if not stored:
+        return False
+    return (sig[0] == stored[0] and sig[1] == stored[1]
+            and (sig[2] == stored[2] or not sig[2] or not stored[2]))
+
+
+def trusted_sig(st: os.stat_result | None) -> list | None:
+    """
+    Signature safe to record in state, or None.
+
+    A file modified within RACY_WINDOW_NS could change again inside the same mtime tick
+    without its signature changing, so its signature is not recorded until it has settled.
+    """
+    if st is None or time.time_ns() - st.st_mtime_ns < RACY_WINDOW_NS:
+        return None
+    return stat_sig(st)
+
+
+def file_stat(path: Path) -> os.stat_result | None:
     try:
-        h = hashlib.sha256()
-        h.update(path.read_bytes())
-        return h.hexdigest()
+        st = path.stat()
     except OSError:
         return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+def sig_unchanged(st: os.stat_result | None, known: str | None,
+                  stored_sig: list | None, verify: bool) -> bool:
+    """
+    True if the file provably still holds the known content, without reading it.
+
+    That is the case when its stat signature matches the one recorded with the known
+    checksum. verify=True never trusts signatures.
+    """
+    return (not verify and known is not None and st is not None
+            and sig_matches(stat_sig(st), stored_sig))
+
+
+class SyncState(MutableMapping):
+    """
+    Checksum baseline {rel: entry} for one project, plus where and how it is persisted.
+
+    STATE_FILE is a snapshot {"format": 2, "hash": algo, "dirs": index, "files": {rel: entry}}
+    that is only ever replaced atomically ("dirs" holds each side's directory listings, see
+    reconcile()). Every change in between is appended to STATE_JOURNAL as one JSON line
+    {"p": rel, "e": entry}, plus "c": conflict while rel has an unresolved conflict, so
+    recording a sync costs O(1) instead of a full rewrite. load_state() replays the journal
+    over the snapshot without writing anything; save_state() compacts both into a new
+    snapshot, which only the process holding the project's lock does (first in
+    configure_state()). Callers hold state_lock around both.
+
+    In memory the entries are stored column-wise rather than as one dict per file: each
+    interned path maps to a slot, and a slot's raw digest, last_sync and both stat
+    signatures live in flat arrays. Lookups return a fresh entry dict
+    {"checksum", "last_sync", "local_sig", "vault_sig"}; to change an entry, assign one.
+    """
+
+    __slots__ = ("state_file", "journal_file", "journal_fh", "journal_records", "stale", "meta",
+                 "durability", "move_index", "_slots", "_paths", "_free", "_digests",
+                 "_digest_len", "_flags", "_last_sync", "_size", "_mtime", "_ino")
+
+    _CHECKSUM, _LOCAL_SIG, _VAULT_SIG = 1, 2, 4   # _flags bits: which fields a slot holds
+
+    def __init__(self, root: Path = Path(".")):
+        self.state_file      = root / STATE_FILE
+        self.journal_file    = root / STATE_JOURNAL
+        self.journal_fh      = None
+        self.journal_records = 0
+        self.stale           = False                # Legacy format or torn journal tail on disk
+        self.meta            = {"hash": "sha256"}   # Snapshot header fields other than "files"
+        self.durability      = "file"               # sync.durability, set by configure_state()
+        self.move_index      = None                 # MoveIndex, built on first use
+
+        self._slots: dict[str, int] = {}   # interned rel → slot
+        self._paths: list = []             # slot → rel, None if free
+        self._free: list = []
+        self._digests    = bytearray()       # DIGEST_SLOT raw bytes per slot
+        self._digest_len = array("B")
+        self._flags      = array("B")
+        self._last_sync  = array("d")
+        self._size       = array("q")        # Two per slot: local, vault
+        self._mtime      = array("q")
+        self._ino        = array("Q")
+
+    def _alloc(self, rel: str) -> int:
+        if self._free:
+            slot = self._free.pop()
+            self._paths[slot] = rel
+            return slot
+        self._paths.append(rel)
+        self._digests.extend(bytes(DIGEST_SLOT))
+        self._digest_len.append(0)
+        self._flags.append(0)
+        self._last_sync.append(0.0)
+        for column in (self._size, self._mtime, self._ino):
+            column.extend((0, 0))
+        return len(self._paths) - 1
+
+    def _entry(self, slot: int) -> dict:
+        flags, i, d = self._flags[slot], 2 * slot, DIGEST_SLOT * slot
+        return {
+            "checksum":  self._digests[d:d + self._digest_len[slot]].hex() if flags & self._CHECKSUM else None,
+            "last_sync": self._last_sync[slot],
+            "local_sig": [self._size[i], self._mtime[i], self._ino[i]] if flags & self._LOCAL_SIG else None,
+            "vault_sig": [self._size[i + 1], self._mtime[i + 1], self._ino[i + 1]] if flags & self._VAULT_SIG else None,
+        }
+
+    def __getitem__(self, rel: str) -> dict:
+        return self._entry(self._slots[rel])
+
+    def get(self, rel: str, default=None):
+        slot = self._slots.get(rel)
+        return default if slot is None else self._entry(slot)
+
+    def __contains__(self, rel) -> bool:
+        return rel in self._slots
+
+    def __iter__(self):
+        return iter(self._slots)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    # Item assignment and removal keep the move index current.
+    def __setitem__(self, rel: str, entry: dict):
+        slot = self._slots.get(rel)
+        if self.move_index is not None:
+            if slot is not None:
+                self.move_index.discard(rel, self._entry(slot))
+            self.move_index.add(rel, entry)
+        if slot is None:
+            rel  = sys.intern(rel)
+            slot = self._slots[rel] = self._alloc(rel)
+
+        flags = 0
+        try:
+            raw = bytes.fromhex(entry.get("checksum") or "")
+        except ValueError:
+            raw = b""   # Not a digest we wrote — treat as no baseline
+        if 0 < len(raw) <= DIGEST_SLOT:
+            d = DIGEST_SLOT * slot
+            self._digests[d:d + len(raw)] = raw
+            self._digest_len[slot] = len(raw)
+            flags |= self._CHECKSUM
+        self._last_sync[slot] = entry.get("last_sync") or 0.0
+        for bit, i, key in ((self._LOCAL_SIG, 2 * slot, "local_sig"), (self._VAULT_SIG, 2 * slot + 1, "vault_sig")):
+            sig = entry.get(key)
+            if sig:
+                self._size[i], self._mtime[i], self._ino[i] = sig
+                flags |= bit
+        self._flags[slot] = flags
+
+    def __delitem__(self, rel: str):
+        slot = self._slots.pop(rel)
+        if self.move_index is not None:
+            self.move_index.discard(rel, self._entry(slot))
+        self._paths[slot] = None
+        self._flags[slot] = 0
+        self._free.append(slot)
+
+    def pair_unchanged(self, rel: str, local_st: os.stat_result | None,
+                       vault_st: os.stat_result | None) -> bool:
+        """True if both sides still carry the stat signatures recorded with rel's baseline."""
+        slot = self._slots.get(rel)
+        if slot is None or local_st is None or vault_st is None:
+            return False
+        if self._flags[slot] != self._CHECKSUM | self._LOCAL_SIG | self._VAULT_SIG:
+            return False
+        i = 2 * slot
+        for st in (local_st, vault_st):
+            if (st.st_size != self._size[i] or st.st_mtime_ns != self._mtime[i]
+                    or (st.st_ino != self._ino[i] and st.st_ino and self._ino[i])):
+                return False
+            i += 1
+        return True
 
+    @property
+    def conflicts(self) -> dict:
+        """Registry of unresolved conflicts {rel: {"local", "vault", "local_sig", "vault_sig", "backup", "since"}}."""
+        return self.meta.setdefault("conflicts", {})
+
+    def moves(self) -> "MoveIndex":
+        if self.move_index is None:
+            self.move_index = MoveIndex(self)
+        return self.move_index
+
+
+class MoveIndex:
+    """
+    Baseline entries by checksum, so a new file can be recognized as a known one moved.
+
+    Only entries with a recorded stat signature are indexed: a move is replayed on the
+    other side only if that side provably still holds the baseline, which needs its
+    signature. sizes counts the indexed entries per file size, so files of a size no
+    baseline entry has are ruled out with one lookup; stamps finds the entries recorded
+    with a given (size, mtime_ns), so a file renamed in place (same size, mtime and inode
+    as a vanished entry) is matched without being read.
+    """
+
+    __slots__ = ("paths", "sizes", "stamps")
+
+    def __init__(self, state: dict):
+        self.paths:  dict[str, set]   = {}   # checksum → {rel}
+        self.sizes:  dict[int, int]   = {}   # size → indexed entries of that size
+        self.stamps: dict[tuple, set] = {}   # (size, mtime_ns) of either side's sig → {rel}
+        for rel, entry in state.items():
+            self.add(rel, entry)
+
+    @staticmethod
+    def _sigs(entry: dict | None) -> list:
+        if not entry or not entry.get("checksum"):
+            return []
+        return [sig for sig in (entry.get("local_sig"), entry.get("vault_sig")) if sig]
+
+    def add(self, rel: str, entry: dict | None):
+        sigs = self._sigs(entry)
+        if not sigs:
+            return
+        self.paths.setdefault(entry["checksum"], set()).add(rel)
+        self.sizes[sigs[0][0]] = self.sizes.get(sigs[0][0], 0) + 1
+        for sig in sigs:
+            self.stamps.setdefault((sig[0], sig[1]), set()).add(rel)
+
+    def discard(self, rel: str, entry: dict | None):
+        sigs = self._sigs(entry)
+        if not sigs or rel not in self.paths.get(entry["checksum"], ()):
+            return
+        _discard(self.paths, entry["checksum"], rel)
+        self.sizes[sigs[0][0]] -= 1
+        if not self.sizes[sigs[0][0]]:
+            del self.sizes[sigs[0][0]]
+        for sig in sigs:
+            _discard(self.stamps, (sig[0], sig[1]), rel)
+
+
+def _discard(groups: dict, key, member):
+    group = groups.get(key)
+    if group is not None:
+        group.discard(member)
+        if not group:
+            del groups[key]
+
+
+def _atomic_write(path: Path, text: str):
+    """Write text to path via a temp file + fsync + rename, so path is never left truncated."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+@profiler.phase("state load")
+def load_state(root: Path = Path(".")) -> SyncState:
+    """
+    Load the snapshot (or a legacy flat JSON state) and replay the journal.
+
+    Nothing is written back: the owning process compacts in configure_state(), so read-only
+    callers never rewrite the files under a running instance.
+    """
+    state    = SyncState(root)
+    migrated = False
+
+    if state.state_file.exists():
+        try:
+            data = json.loads(state.state_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            backup = state.state_file.with_name(STATE_FILE.name + ".corrupt")
+            log("error", f"Unreadable {STATE_FILE} ({e}) — moved to {backup.name}, starting fresh.")
+            os.replace(state.state_file, backup)
+            data = {}
+        if isinstance(data.get("format"), int) and isinstance(data.get("files"), dict):
+            state.update(data["files"])
+            state.meta["hash"] = data.get("hash", "sha256")
+            for key in ("dirs", "conflicts"):
+                if isinstance(data.get(key), dict):
+                    state.meta[key] = data[key]
+        else:
+            state.update(data)   # Legacy flat {rel: entry} file from before the journal
+            migrated = bool(data)
+
+    replayed, torn = 0, False
+    if state.journal_file.exists():
+        with open(state.journal_file, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                    rel, entry = rec["p"], rec["e"]
+                except (ValueError, KeyError, TypeError):
+                    log("info", f"Ignoring torn record at end of {STATE_JOURNAL}.")
+                    torn = True
+                    break
+                if entry is None:
+                    state.pop(rel, None)
+                else:
+                    state[rel] = entry
+                if "c" in rec:
+                    state.conflicts[rel] = rec["c"]
+                else:
+                    state.conflicts.pop(rel, None)
+                replayed += 1
+    state.journal_records = replayed
+    state.stale           = migrated or torn
+
+    if migrated:
+        log("info", f"Migrating {len(state)} entries from legacy {STATE_FILE} format.")
+    return state
+
+
+def record_state(state: SyncState, rel_str: str, lock: threading.Lock):
+    """Append the current entry for rel_str (or its removal) to the journal."""
+    record_states(state, [rel_str], lock)
+
+
+@profiler.phase("persist")
+def record_states(state: SyncState, rel_strs: list, lock: threading.Lock):
+    """Append the current entries for rel_strs to the journal in a single write."""
+    if not rel_strs:
+        return
+    with lock:
+        if state.journal_fh is None:
+            state.journal_fh = open(state.journal_file, "a", encoding="utf-8")
+        conflicts = state.conflicts
+        state.journal_fh.write("".join(
+            json.dumps({"p": rel_str, "e": state.get(rel_str), "c": conflicts[rel_str]}
+                       if rel_str in conflicts else {"p": rel_str, "e": state.get(rel_str)},
+                       separators=(",", ":")) + "\n"
+            for rel_str in rel_strs
+        ))
+        state.journal_fh.flush()
+        state.journal_records += len(rel_strs)
+        due = state.journal_records >= max(COMPACT_MIN, len(state))
+    if due:
+        save_state(state, lock)
+
+
+@profiler.phase("persist")
+def save_state(state: SyncState, lock: threading.Lock):
+    """Compact: atomically write a full snapshot, then truncate the journal."""
+    t0 = time.perf_counter() if metrics.enabled else 0.0
+    with lock:
+        header = json.dumps({"format": STATE_FORMAT, **state.meta}, separators=(",", ":"))
+        files  = ",".join(f"{json.dumps(rel)}:{json.dumps(entry, separators=(',', ':'))}"
+                          for rel, entry in state.items())
+        _atomic_write(state.state_file, f'{header[:-1]},"files":{{{files}}}}}')
+        if state.journal_fh is not None:
+            state.journal_fh.close()
+            state.journal_fh = None
+        # A crash before this truncate only replays records already in the snapshot.
+        open(state.journal_file, "w").close()
+        state.journal_records = 0
+        state.stale           = False
+    if t0:
+        metrics.observe("vault_sync_state_save_seconds", time.perf_counter() - t0)
+
+
+def rehash_state(cfg: dict, state: SyncState, state_lock: threading.Lock, new_name: str):
+    """
+    Convert the checksum baseline to a new hash algorithm, then compact.
+
+    Each baseline entry is re-hashed from whichever side still holds the baseline content —
+    verified with the old algorithm in the same read pass. Entries where neither side
+    matches keep their old digest, so they still surface as conflicts exactly as before.
+    The two versions of each registered conflict are converted the same way (the vault
+    version from the backup if the vault copy moved on); a version no file holds any more
+    keeps its old digest and counts as edited since the conflict.
+    """
+    old_name = state.meta["hash"]
+    log("info", f"Hash algorithm changed ({old_name} -> {new_name}): re-hashing {len(state)} baseline entries...")
+    converted = 0
+    for rel_str, entry in list(state.items()):
+        for side, root in (("local", cfg["local_root"]), ("vault", cfg["vault_project"])):
+            digests = file_digests(root / rel_str, [old_name, new_name], side)
+            if digests and digests[0] == entry.get("checksum"):
+                with state_lock:
+                    state[rel_str] = {**entry, "checksum": digests[1]}
+                converted += 1
+                break
+    for rel_str, conflict in list(state.conflicts.items()):
+        update = {}
+        for side, path, read_side in (("local", cfg["local_root"] / rel_str, "local"),
+                                      ("vault", cfg["vault_project"] / rel_str, "vault"),
+                                      ("vault", cfg["local_root"] / conflict["backup"], "local")):
+            if side not in update:
+                digests = file_digests(path, [old_name, new_name], read_side)
+                if digests and digests[0] == conflict[side]:
+                    update[side] = digests[1]
+        with state_lock:
+            state.conflicts[rel_str] = {**conflict, **update}
+    with state_lock:
+        state.meta["hash"] = new_name
+    save_state(state, state_lock)
+    log("info", f"Re-hashed {converted} of {len(state)} baseline entries.")
+
+
+def configure_state(cfg: dict, state: SyncState, state_lock: threading.Lock):
+    """
+    Apply sync.hash and sync.durability to freshly loaded state, converting the baseline if
+    the hash changed, and compact what load_state() replayed. Only the lock holder calls this.
+    """
+    if state and state.meta["hash"] != cfg["hash"]:
+        rehash_state(cfg, state, state_lock, cfg["hash"])
+    state.meta["hash"] = cfg["hash"]
+    state.durability   = cfg["durability"]
+    if state_dirty(state):
+        # Before anything is appended: a torn tail left in place would swallow the next record
+        save_state(state, state_lock)
+
+
+def state_dirty(state: SyncState) -> bool:
+    """True if the journal holds records not yet compacted into the snapshot, or the files on disk need rewriting."""
+    return state.journal_records > 0 or state.stale
 
-def load_state() -> dict:
-    if STATE_FILE.exists():
+
+# ── Echo suppression ──────────────────────────────────────────────────────────
+
+class EchoFilter:
+    """
+    Remembers files this process just wrote so the watcher on that side can ignore them.
+
+    Each write is recorded with the signature the file had right after the copy. An event
+    for that path within ECHO_TTL whose file still has that signature is our own write
+    echoing back and is dropped — one stat, no read, no hash, no debounce. If the file
+    was edited again in the meantime its signature differs and the event goes through.
+    """
+
+    def __init__(self, ttl: float = ECHO_TTL, limit: int = ECHO_LIMIT):
+        self.ttl   = ttl
+        self.limit = limit
+        self._expected: OrderedDict[str, tuple] = OrderedDict()   # normalized path → (stat_sig, expiry)
+        self._lock = threading.Lock()
+        self.suppressed = 0
+
+    def expect(self, path: Path, st: os.stat_result | None):
+        if st is None:
+            return
+        key = os.path.normpath(str(path))
+        now = time.monotonic()
+        with self._lock:
+            expected = self._expected
+            expected[key] = (stat_sig(st), now + self.ttl)
+            expected.move_to_end(key)
+            # Every entry lives ttl seconds, so insertion order is expiry order
+            while expected and (len(expected) > self.limit or next(iter(expected.values()))[1] <= now):
+                expected.popitem(last=False)
+
+    def is_echo(self, path_str: str) -> bool:
+        key = os.path.normpath(path_str)
+        with self._lock:
+            expected = self._expected.get(key)
+        if expected is None:
+            return False
+        if expected[1] < time.monotonic():
+            with self._lock:
+                self._expected.pop(key, None)
+            return False
+        st = file_stat(Path(path_str))
+        if st is None or stat_sig(st) != expected[0]:
+            return False
+        with self._lock:
+            self.suppressed += 1
+        return True
+
+
+echo_filter = EchoFilter()
+
+
+# ── Transfers ─────────────────────────────────────────────────────────────────
+
+def _kernel_copy(fin, fout):
+    """Copy fin to fout inside the kernel where the OS allows it, else through a buffer."""
+    if sys.platform == "linux":
+        import fcntl
+        in_fd, out_fd = fin.fileno(), fout.fileno()
         try:
-            return json.loads(STATE_FILE.read_text(encoding="utf-8"))
-        except Exception:
-            return {}
-    return {}
+            fcntl.ioctl(out_fd, FICLONE, in_fd)   # Reflink (btrfs, XFS): shares extents, O(1)
+            return
+        except OSError:
+            pass
+        size = os.fstat(in_fd).st_size
+        for copy_fn in (lambda n: os.copy_file_range(in_fd, out_fd, n),
+                        lambda n: os.sendfile(out_fd, in_fd, None, n)):
+            try:
+                done = 0
+                while done < size:
+                    n = copy_fn(min(size - done, 1 << 30))
+                    if n == 0:
+                        break
+                    done += n
+                return
+            except OSError:
+                fin.seek(0)    # e.g. EXDEV / ENOSYS on older kernels — restart with the next method
+                fout.seek(0)
+                fout.truncate()
+    shutil.copyfileobj(fin, fout, HASH_CHUNK)
+
+
+@profiler.phase("copy")
+def transfer(src: Path, dst: Path, digest: str | None = None, skip_if: str | None = None,
+             hash_name: str = "sha256", durability: str = "file", side: str = "") -> tuple:
+    """
+    Copy src over dst atomically and return (digest, written).
+
+    The data goes to a temp file next to dst, is fsynced according to durability,
+    gets src's timestamps and is renamed over dst, so dst is never seen half-written.
+    If digest (src's checksum) is already known, the bytes are copied in the kernel
+    (reflink, copy_file_range or sendfile on Linux). Otherwise src is hashed while it is
+    streamed — one read for both — and if the result equals skip_if the content is
+    unchanged, the temp file is discarded and written is False.
+    Returns (None, False) if src cannot be read. side names src's side for the metrics.
+    """
+    t0 = time.perf_counter() if metrics.enabled else 0.0
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}{TMP_SUFFIX}")
+    try:
+        fin = open(src, "rb")
+    except OSError:
+        return None, False
+    try:
+        with fin, open(tmp, "wb") as fout:
+            if digest is None:
+                h = HASH_ALGORITHMS[hash_name]()
+                buf = bytearray(HASH_CHUNK)
+                view = memoryview(buf)
+                while n := fin.readinto(buf):
+                    h.update(view[:n])
+                    fout.write(view[:n])
+                digest = h.hexdigest()
+                if digest == skip_if:
+                    fout.close()
+                    tmp.unlink()
+                    if t0:
+                        metrics.inc("vault_sync_hash_bytes_total", fin.tell(), side=side or "other")
+                        metrics.inc("vault_sync_hash_seconds_total", time.perf_counter() - t0, side=side or "other")
+                    return digest, False
+            else:
+                _kernel_copy(fin, fout)
+            fout.flush()
+            copied = os.fstat(fout.fileno()).st_size
+            if durability != "off":
+                os.fsync(fout.fileno())
+        shutil.copystat(src, tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    if durability == "full":
+        _fsync_dir(dst.parent)   # Make the rename itself durable
+    if t0:
+        metrics.inc("vault_sync_copy_bytes_total", copied, side=side or "other")
+        metrics.inc("vault_sync_copy_seconds_total", time.perf_counter() - t0, side=side or "other")
+    return digest, True
+
+
+def _fsync_dir(path: Path):
+    if os.name == "nt":
+        return   # Directories cannot be opened for fsync on Windows
+    dir_fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
 
 
-def save_state(state: dict, lock: threading.Lock):
-    with lock:
-        STATE_FILE.write_text(json.dumps(state, indent=2), encoding="utf-8")
+def move_file(src: Path, dst: Path, durability: str = "file") -> bool:
+    """Rename src to dst, creating dst's folder. Never replaces an existing dst; False if not moved."""
+    try:
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        if dst.exists():
+            return False
+        os.rename(src, dst)
+    except OSError:
+        return False
+    if durability == "full":
+        _fsync_dir(dst.parent)
+        _fsync_dir(src.parent)
+    return True
 
 
 # ── Three-way sync logic ──────────────────────────────────────────────────────
 
+class PassSummary:
+    """Files per sync_pair() outcome and bytes copied over one pass or batch."""
+
+    OUTCOMES = ("to_vault", "from_vault", "moved", "skipped", "resolved", "conflict", "error")
+
+    def __init__(self):
+        self.counts  = dict.fromkeys(self.OUTCOMES, 0)
+        self.bytes   = 0
+        self.started = time.monotonic()
+
+    def add(self, outcome: str, nbytes: int = 0, count: int = 1):
+        self.counts[outcome] += count
+        self.bytes += nbytes
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def fields(self) -> dict:
+        """The counts as JSON-lines log fields."""
+        return {**self.counts, "bytes": self.bytes, "seconds": round(time.monotonic() - self.started, 3)}
+
+    def __str__(self) -> str:
+        c     = self.counts
+        parts = [f"{c['to_vault']} -> vault", f"{c['from_vault']} <- vault", f"{c['skipped']} skipped"]
+        parts += [f"{c[k]} {label}" for k, label in (("moved", "moved"), ("resolved", "resolved"),
+                                                     ("conflict", "conflict(s)"), ("error", "error(s)")) if c[k]]
+        return (", ".join(parts) + f", {self.bytes / 2**20:.1f} MB copied "
+                f"in {time.monotonic() - self.started:.2f}s")
+
+
+@profiler.phase("decide")
 def sync_pair(local: Path, vault: Path, rel_str: str,
-              state: dict, state_lock: threading.Lock):
-    """Apply three-way sync logic for one file pair. Updates state in-place."""
-    known     = state.get(rel_str, {}).get("checksum")
-    local_cs  = checksum(local)
-    vault_cs  = checksum(vault)
+              state: SyncState, state_lock: threading.Lock,
+              local_st: os.stat_result | None = None,
+              vault_st: os.stat_result | None = None,
+              verify: bool = False,
+              journal: list | None = None,
+              project: str | None = None) -> tuple:
+    """
+    Apply three-way sync logic for one file pair. Updates state in-place.
+    Returns (outcome, bytes copied), outcome being one of PassSummary.OUTCOMES but "moved".
+    project (cfg["project"], daemon mode) names the project on every line logged.
+
+    local_st / vault_st are optional stat results from a directory scan; files whose
+    signature matches the one stored in state are treated as unchanged without hashing.
+    If journal is given (batch mode), changed paths are appended to it for the caller to
+    commit with record_states(), and log lines are not flushed individually.
+
+    A conflict is recorded in state.conflicts with both sides' digests and signatures.
+    While neither side's signature moves it costs two stats — no hashing, no new backup.
+    Once the sides are equal again the conflict is resolved; if only the local file changed
+    since the conflict (the user's merge), it wins. A vault edit on top of an unmerged
+    conflict is backed up again — the local file is never overwritten while conflicted.
+    """
+    flush     = journal is None
+    entry     = state.get(rel_str, {})
+    known     = entry.get("checksum")
+    conflict  = state.conflicts.get(rel_str)
+    io_opts   = {"hash_name": state.meta["hash"], "durability": state.durability}
+    local_st  = local_st or file_stat(local)
+    vault_st  = vault_st or file_stat(vault)
+
+    def commit():
+        if journal is None:
+            record_state(state, rel_str, state_lock)
+        else:
+            journal.append(rel_str)
+
+    if (conflict is not None and not verify and local_st is not None and vault_st is not None
+            and sig_matches(stat_sig(local_st), conflict["local_sig"])
+            and sig_matches(stat_sig(vault_st), conflict["vault_sig"])):
+        return "skipped", 0   # Known conflict, neither side touched since — already backed up
+
+    local_cs  = known if sig_unchanged(local_st, known, entry.get("local_sig"), verify) else None
+    vault_cs  = known if sig_unchanged(vault_st, known, entry.get("vault_sig"), verify) else None
+
+    # When one side provably holds the baseline (or it and the baseline are both absent),
+    # the other side can only be unchanged or the winner. Hash it while copying it across,
+    # so a changed file is read once instead of hashed, re-read and copied.
+    fused = None
+    if local_st and local_cs is None and (vault_cs is not None or (vault_st is None and known is None)):
+        local_cs, written = transfer(local, vault, skip_if=known, side="local", **io_opts)
+        fused = "local" if written else None
+        local_st = local_st if local_cs is not None else None
+    elif vault_st and vault_cs is None and (local_cs is not None or (local_st is None and known is None)):
+        vault_cs, written = transfer(vault, local, skip_if=known, side="vault", **io_opts)
+        fused = "vault" if written else None
+        vault_st = vault_st if vault_cs is not None else None
+    if local_cs is None and local_st is not None:
+        local_cs = checksum(local, state.meta["hash"], "local")
+    if vault_cs is None and vault_st is not None:
+        vault_cs = checksum(vault, state.meta["hash"], "vault")
 
     if local_cs is None and vault_cs is None:
-        return  # Both absent — nothing to do
+        if conflict is not None:
+            with state_lock:
+                state.conflicts.pop(rel_str, None)
+            commit()
+        return "skipped", 0   # Both absent — nothing to do
+
+    if conflict is not None and local_cs is not None and vault_cs is not None:
+        if local_cs == vault_cs:
+            # The merge made both sides equal — that content is the new baseline
+            with state_lock:
+                state.conflicts.pop(rel_str, None)
+                state[rel_str] = {
+                    "checksum":  local_cs,
+                    "last_sync": time.time(),
+                    "local_sig": trusted_sig(local_st),
+                    "vault_sig": trusted_sig(vault_st),
+                }
+            log("resolved", f"{rel_str}  (both sides equal)", flush, path=rel_str, project=project)
+            commit()
+            return "resolved", 0
+        if local_cs == conflict["local"] and vault_cs == conflict["vault"]:
+            # Still the recorded conflict (e.g. only touched) — refresh its signatures
+            with state_lock:
+                state.conflicts[rel_str] = {**conflict, "local_sig": trusted_sig(local_st),
+                                            "vault_sig": trusted_sig(vault_st)}
+            commit()
+            return "skipped", 0
+        # Only the local file moved on since the conflict: that is the user's merge, so it
+        # wins against the recorded vault version. A vault edit while the local file still
+        # holds its conflicted content falls through to a new conflict and a new backup.
+        if vault_cs == conflict["vault"]:
+            known = conflict["vault"]
+
+    if local_cs is not None and local_cs == vault_cs != known:
+        # Same content on both sides but no matching baseline (e.g. copied by a pass that was
+        # killed before its journal write) — nothing to copy, no conflict: adopt it
+        with state_lock:
+            state[rel_str] = {
+                "checksum":  local_cs,
+                "last_sync": time.time(),
+                "local_sig": trusted_sig(local_st),
+                "vault_sig": trusted_sig(vault_st),
+            }
+        log("skip", f"{rel_str}  (same on both sides, baseline recorded)", flush, path=rel_str, project=project)
+        commit()
+        return "skipped", 0
 
     local_changed = (local_cs != known)
     vault_changed = (vault_cs != known)
 
     if local_changed and not vault_changed and local_cs is not None:
         # Local wins → copy to vault
-        vault.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(local, vault)
+        if fused != "local":
+            transfer(local, vault, digest=local_cs, side="local", **io_opts)
+        written = file_stat(vault)
+        echo_filter.expect(vault, written)
         with state_lock:
-            state[rel_str] = {"checksum": local_cs, "last_sync": time.time()}
-        log("sync", f"{rel_str}  ->  vault")
-        save_state(state, state_lock)
+            state.conflicts.pop(rel_str, None)
+            state[rel_str] = {
+                "checksum":  local_cs,
+                "last_sync": time.time(),
+                "local_sig": trusted_sig(local_st),
+                "vault_sig": trusted_sig(written),
+            }
+        nbytes = written.st_size if written else 0
+        log("sync", f"{rel_str}  ->  vault", flush, path=rel_str, to="vault", bytes=nbytes, project=project)
+        metrics.inc("vault_sync_files_synced_total", side="local")
+        commit()
+        return "to_vault", nbytes
 
     elif vault_changed and not local_changed and vault_cs is not None:
         # Vault wins → copy to local
-        local.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(vault, local)
+        if fused != "vault":
+            transfer(vault, local, digest=vault_cs, side="vault", **io_opts)
+        written = file_stat(local)
+        echo_filter.expect(local, written)
         with state_lock:
-            state[rel_str] = {"checksum": vault_cs, "last_sync": time.time()}
-        log("sync", f"{rel_str}  <-  vault")
-        save_state(state, state_lock)
+            state.conflicts.pop(rel_str, None)
+            state[rel_str] = {
+                "checksum":  vault_cs,
+                "last_sync": time.time(),
+                "local_sig": trusted_sig(written),
+                "vault_sig": trusted_sig(vault_st),
+            }
+        nbytes = written.st_size if written else 0
+        log("sync", f"{rel_str}  <-  vault", flush, path=rel_str, to="local", bytes=nbytes, project=project)
+        metrics.inc("vault_sync_files_synced_total", side="vault")
+        commit()
+        return "from_vault", nbytes
 
     elif local_changed and vault_changed and local_cs is not None and vault_cs is not None:
         # Both changed → conflict: save vault version alongside local, keep local.
-        # Do NOT update state — leave the pre-conflict baseline so the conflict is
-        # re-detected on every reconciliation until the user resolves it manually.
-        conflict_name = f"{local.stem}.obsidian-{ts_suffix()}{local.suffix}"
+        # Do NOT update the baseline — the conflict is registered instead and stays
+        # listed (--conflicts) until the user resolves it manually.
+        stamp         = ts_suffix()
+        conflict_name = f"{local.stem}.obsidian-{stamp}{local.suffix}"
+        n = 1
+        while (local.parent / conflict_name).exists():   # Never overwrite an earlier backup
+            n += 1
+            conflict_name = f"{local.stem}.obsidian-{stamp}-{n}{local.suffix}"
         conflict_path = local.parent / conflict_name
         try:
             shutil.copy2(vault, conflict_path)
         except OSError as e:
-            log("error", f"Could not save conflict file: {e}")
-            return
-        log("CONFLICT", f"{rel_str}")
-        print(f"             Both local and vault were edited since last sync.")
-        print(f"             Vault version saved as: {conflict_name}")
-        print(f"             Merge manually, then run /sync-vault to resync.")
+            log("error", f"Could not save conflict file: {e}", path=rel_str, project=project)
+            return "error", 0
+        with state_lock:
+            state.conflicts[rel_str] = {
+                "local":     local_cs,
+                "vault":     vault_cs,
+                "local_sig": trusted_sig(local_st),
+                "vault_sig": trusted_sig(vault_st),
+                "backup":    conflict_path.relative_to(local.parents[rel_str.count("/")]).as_posix(),
+                "since":     conflict["since"] if conflict else time.time(),
+            }
+        commit()
+        metrics.inc("vault_sync_conflicts_total")
+        log("CONFLICT", f"{rel_str}\n"
+                        f"             Both local and vault were edited since last sync.\n"
+                        f"             Vault version saved as: {conflict_name}\n"
+                        f"             Merge manually, then run /sync-vault to resync.",
+            path=rel_str, backup=conflict_name, project=project)
+        return "conflict", 0
 
     else:
-        log("skip", f"{rel_str}  (no change)")
-
-
-# ── Reconciliation ────────────────────────────────────────────────────────────
+        if local_cs is not None and vault_cs is not None:
+            # Both sides match the baseline — refresh signatures so the next pass skips hashing.
+            local_sig = trusted_sig(local_st)
+            vault_sig = trusted_sig(vault_st)
+            if entry.get("local_sig") != local_sig or entry.get("vault_sig") != vault_sig:
+                with state_lock:
+                    state[rel_str] = {**entry, "local_sig": local_sig, "vault_sig": vault_sig}
+                commit()
+        log("skip", f"{rel_str}  (no change)", flush, path=rel_str, project=project)
+        return "skipped", 0
+
+
+# ── Batches and reconciliation ────────────────────────────────────────────────
+
+@profiler.phase("moves")
+def replay_moves(cfg: dict, state: SyncState, state_lock: threading.Lock, rel_strs: list,
+                 local_stats: dict | None = None, vault_stats: dict | None = None,
+                 handled: set | None = None) -> list:
+    """
+    Replay files moved on one side as renames on the other, and return the paths left to sync.
+
+    A path with no baseline that exists on one side only is a move if its content matches
+    the baseline of a known path that has vanished from that same side while the other
+    side still provably holds it there. The other side's copy is then renamed — no bytes
+    are copied — and the baseline entry moves with it. A plain rename is matched by its
+    stat signature without reading the file; files of a size no baseline entry has are
+    never hashed here.
+
+    handled collects both paths of every replayed move; pass the same set across calls
+    when a pass is replayed in chunks, so a later chunk skips paths already dealt with.
+    """
+    if not state:
+        return rel_strs
+    index   = state.moves()
+    sides   = (("local", cfg["local_root"], local_stats), ("vault", cfg["vault_project"], vault_stats))
+    handled = set() if handled is None else handled
+    changed = []
+
+    for rel_str in rel_strs:
+        if rel_str in state or rel_str in handled:
+            continue
+        stats = [st.get(rel_str) if st is not None else file_stat(root / rel_str) for _, root, st in sides]
+        if (stats[0] is None) == (stats[1] is None):
+            continue   # On both sides or on neither — not a one-sided move
+        src = 0 if stats[0] is not None else 1
+        src_name, src_root, _ = sides[src]
+        dst_name, dst_root, _ = sides[1 - src]
+        if stats[src].st_size not in index.sizes:
+            continue
+        # A rename keeps size, mtime and inode: match on the signature before reading anything
+        # The index sets change under state_lock while workers sync: read them under it too
+        src_sig = stat_sig(stats[src])
+        with state_lock:
+            renamed = sorted(old for old in index.stamps.get((src_sig[0], src_sig[1]), ())
+                             if src_sig[2] and sig_matches(src_sig, state[old].get(f"{src_name}_sig")))
+        if not renamed:
+            digest = checksum(src_root / rel_str, state.meta["hash"], src_name)
+            with state_lock:
+                renamed = sorted(index.paths.get(digest, ()))
+        for old in renamed:
+            entry  = state[old]
+            digest = entry["checksum"]
+            if old in handled or old in state.conflicts or file_stat(src_root / old) is not None:
+                continue   # Still there — a copy, not a move
+            dst_old = dst_root / old
+            dst_st  = file_stat(dst_old)
+            if not sig_unchanged(dst_st, digest, entry.get(f"{dst_name}_sig"), False):
+                continue
+            if not move_file(dst_old, dst_root / rel_str, state.durability):
+                continue
+            moved = file_stat(dst_root / rel_str)
+            echo_filter.expect(dst_root / rel_str, moved)
+            sigs = {src_name: trusted_sig(stats[src]), dst_name: trusted_sig(moved)}
+            with state_lock:
+                state.pop(old)
+                state[rel_str] = {
+                    "checksum":  digest,
+                    "last_sync": time.time(),
+                    "local_sig": sigs["local"],
+                    "vault_sig": sigs["vault"],
+                }
+            log("move", f"{old}  =>  {rel_str}  (moved in {src_name}, renamed in {dst_name})", False,
+                path=rel_str, old_path=old, side=src_name, project=cfg.get("project"))
+            handled.update((old, rel_str))
+            changed += [old, rel_str]
+            break
+
+    record_states(state, changed, state_lock)
+    return [r for r in rel_strs if r not in handled] if handled else rel_strs
+
+
+def recency(local_st: os.stat_result | None, vault_st: os.stat_result | None) -> int:
+    """Newest mtime (ns) of a file pair — the sync priority. 0 if neither side was stat'ed."""
+    return max(local_st.st_mtime_ns if local_st is not None else 0,
+               vault_st.st_mtime_ns if vault_st is not None else 0)
+
+
+def by_recency(pairs, window: int = PRIORITY_WINDOW):
+    """
+    Reorder (rel_str, local_st, vault_st) pairs so the most recently edited come first.
+
+    At most window pairs are held back: within that many the order is strictly newest
+    first, and a stream with fewer changed files than that is fully sorted. The rest of
+    the stream keeps flowing, so memory stays bounded however long it is.
+    """
+    heap: list = []
+    for seq, item in enumerate(pairs):
+        heapq.heappush(heap, (-recency(item[1], item[2]), seq, item))
+        if len(heap) > window:
+            yield heapq.heappop(heap)[2]
+    while heap:
+        yield heapq.heappop(heap)[2]
+
+
+def sync_stream(cfg: dict, state: SyncState, state_lock: threading.Lock, pairs,
+                verify: bool = False, jobs: int = 1, done=None,
+                scheduler: "DebounceScheduler | None" = None,
+                summary: PassSummary | None = None) -> PassSummary:
+    """
+    Run sync_pair() over an iterable of (rel_str, local_st, vault_st) and return the
+    PassSummary of their outcomes (added to summary if one is given).
+
+    pairs is consumed lazily, so a caller can still be walking the trees while the first
+    files are copied. With jobs > 1, paths are hashed and copied on a pool of worker
+    threads with at most jobs * 64 in flight; each path is handled by exactly one worker
+    and state is only mutated under state_lock. Journal records are committed from this
+    thread in input order, one write per BATCH_COMMIT changed paths, and done(item) is
+    called for each pair as it completes, in the same order.
+
+    When running on scheduler's thread, requests queued with scheduler.call() (the control
+    socket) are served between files instead of after the whole stream: in-flight paths
+    are finished first, so a request never races a worker on the same file.
+    """
+    journal: list = []
+    summary = summary or PassSummary()
+
+    def sync_one(item: tuple) -> tuple:
+        rel_str, local_st, vault_st = item
+        changed: list = []
+        outcome = sync_pair(cfg["local_root"] / rel_str, cfg["vault_project"] / rel_str, rel_str,
+                            state, state_lock, local_st, vault_st, verify, changed, cfg.get("project"))
+        return changed, outcome
+
+    def finish(item: tuple, result: tuple):
+        changed, outcome = result
+        summary.add(*outcome)
+        journal.extend(changed)
+        if len(journal) >= BATCH_COMMIT:
+            record_states(state, journal, state_lock)
+            journal.clear()
+        if done is not None:
+            done(item)
+
+    def serve_requests():
+        record_states(state, journal, state_lock)
+        journal.clear()
+        scheduler.run_calls()
 
-def reconcile(cfg: dict, state: dict, state_lock: threading.Lock):
-    """Compare all tracked files on both sides and sync using three-way logic."""
-    rel_paths = all_tracked_rel_paths(cfg)
-    if not rel_paths:
+    try:
+        if jobs > 1:
+            window = jobs * 64   # Bound the number of in-flight futures on huge trees
+            with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="vault-sync") as pool:
+                in_flight: deque = deque()
+                for item in pairs:
+                    if scheduler is not None and scheduler.has_calls():
+                        while in_flight:
+                            finish(in_flight[0][0], in_flight.popleft()[1].result())
+                        serve_requests()
+                    in_flight.append((item, pool.submit(sync_one, item)))
+                    if len(in_flight) >= window:
+                        finish(in_flight[0][0], in_flight.popleft()[1].result())
+                while in_flight:
+                    finish(in_flight[0][0], in_flight.popleft()[1].result())
+        else:
+            for item in pairs:
+                if scheduler is not None and scheduler.has_calls():
+                    serve_requests()
+                finish(item, sync_one(item))
+    finally:
+        record_states(state, journal, state_lock)
+        log_writer.flush()
+    return summary
+
+
+def sync_batch(cfg: dict, state: SyncState, state_lock: threading.Lock, rel_strs: list,
+               local_stats: dict | None = None, vault_stats: dict | None = None,
+               verify: bool = False, jobs: int = 1, idle_summary: bool = True) -> PassSummary:
+    """
+    Run sync_pair() over rel_strs, most recently edited first, committing state changes in batched writes.
+
+    Moves among them are replayed as renames first (replay_moves()). Every other path is
+    still decided with the same three-way logic; only the journal writes (one per
+    BATCH_COMMIT paths instead of one per path) and log output are coalesced. A summary
+    line is logged at the end, or only when something besides skips happened if not idle_summary.
+    """
+    summary     = PassSummary()
+    handled: set = set()
+    rel_strs    = replay_moves(cfg, state, state_lock, rel_strs, local_stats, vault_stats, handled)
+    local_stats = local_stats or {}
+    vault_stats = vault_stats or {}
+    pairs = [(r, local_stats.get(r) or file_stat(cfg["local_root"] / r),
+              vault_stats.get(r) or file_stat(cfg["vault_project"] / r)) for r in rel_strs]
+    summary.add("moved", count=len(handled) // 2)
+    sync_stream(cfg, state, state_lock, by_recency(pairs, len(pairs)), verify, jobs, summary=summary)
+    if idle_summary or summary.total > summary.counts["skipped"]:
+        log("summary", f"Batch: {summary}", project=cfg.get("project"), **summary.fields())
+    return summary
+
+
+def reconcile(cfg: dict, state: SyncState, state_lock: threading.Lock, verify: bool = False,
+              jobs: int = 1, full: bool = False, roots: list | None = None,
+              scheduler: "DebounceScheduler | None" = None):
+    """
+    Compare all tracked files on both sides and sync using three-way logic.
+
+    The pass is a pipeline: both sides are walked in sorted order and merged on the fly,
+    and each path is decided and handed to the hash/copy workers as soon as both sides
+    have been seen — the first files are synced while the walk is still going, and no
+    tree-sized path list is ever built. Moves are replayed in chunks of BATCH_COMMIT
+    changed paths just before those paths are synced. Changed paths then pass through a
+    PRIORITY_WINDOW-deep reorder buffer, so the files edited most recently — the note
+    just written in Obsidian, not the untouched Report/ archive — are synced first.
+
+    verify=True re-hashes every file instead of trusting matching stat signatures.
+    jobs sets the number of worker threads used for hashing and copying.
+    Unless full (or verify) is set, the walk reuses the directory listings kept in the
+    state's "dirs" index, and files whose stat signatures on both sides still match the
+    baseline are skipped outright instead of going through sync_pair().
+    roots limits the pass to these relative files and folders; the directory index is
+    neither used nor updated then.
+    If the pass runs on scheduler's thread, control requests are served between files.
+    """
+    full  = full or verify
+    index = state.meta.setdefault("dirs", {})
+    rules = [cfg["include"], cfg["exclude"]]
+    if roots is None and (full or index.get("rules") != rules):
+        index.clear()   # Listings filtered by other rules cannot be reused
+        index["rules"] = rules
+    local_index = index.setdefault("local", {}) if roots is None else None
+    vault_index = index.setdefault("vault", {}) if roots is None else None
+    before      = (dict(local_index), dict(vault_index)) if roots is None else (None, None)
+
+    local_walk = walk_side(cfg["local_root"], cfg, roots, local_index)
+    vault_walk = walk_side(cfg["vault_project"], cfg, roots, vault_index)
+
+    log("info", "Reconciling tracked files..." if full else
+                "Reconciling tracked files (skipping those unchanged since last sync)...")
+    total, unchanged = 0, 0
+    handled: set = set()   # Both paths of every replayed move
+    sizes = set(state.moves().sizes) if state else set()   # Only baselines older than this pass can have moved
+
+    def replayed(chunk: list):
+        movable = [r for r, l, v in chunk
+                   if (l is None) != (v is None) and (l or v).st_size in sizes and r not in state]
+        if not movable:
+            return chunk
+        replay_moves(cfg, state, state_lock, movable, {r: l for r, l, _ in chunk if l is not None},
+                     {r: v for r, _, v in chunk if v is not None}, handled)
+        return [item for item in chunk if item[0] not in handled]
+
+    def changed_pairs():
+        nonlocal total, unchanged
+        chunk = []
+        for rel_str, local_st, vault_st in merge_sides(local_walk, vault_walk):
+            total += 1
+            if rel_str in handled:
+                continue   # Renamed by an earlier chunk; this stat predates the move
+            if not full and state.pair_unchanged(rel_str, local_st, vault_st):
+                unchanged += 1
+                continue
+            chunk.append((rel_str, local_st, vault_st))
+            if len(chunk) >= BATCH_COMMIT:
+                yield from replayed(chunk)
+                chunk = []
+        yield from replayed(chunk)
+
+    summary = PassSummary()
+    newest  = [-1, None, 0.0]   # mtime, path and seconds into the pass of the newest edit synced
+
+    def done(item: tuple):
+        mtime = recency(item[1], item[2])
+        if mtime > newest[0]:
+            newest[:] = [mtime, item[0], time.monotonic() - summary.started]
+
+    sync_stream(cfg, state, state_lock, by_recency(changed_pairs()), verify, jobs, done, scheduler, summary)
+    synced = summary.total
+    summary.add("moved", count=len(handled) // 2)
+    summary.add("skipped", count=unchanged)
+    if not total:
         log("info", "No tracked files found.")
         return
+    if state_dirty(state) or (local_index, vault_index) != before:
+        save_state(state, state_lock)
+    if state.conflicts:
+        log("info", f"{len(state.conflicts)} unresolved conflict(s) — list them with: python vault-sync.py --conflicts")
+    log("info", f"Reconciliation complete: {total} tracked file(s), "
+                + ("all checked." if full else f"{unchanged} unchanged since last sync."))
+    if synced and newest[1] is not None:
+        log("info", f"Newest edit {newest[1]} done {newest[2]:.2f}s into the pass ({synced} file(s) checked).")
+    log("summary", f"Pass: {summary}", project=cfg.get("project"), tracked=total, **summary.fields())
+
+
+# ── Debounce scheduler ────────────────────────────────────────────────────────
+
+class DebounceScheduler:
+    """
+    Single thread that fires debounced keys in deadline order.
+
+    Each schedule() for a key pushes its deadline back by `delay` seconds, exactly like
+    cancelling and restarting a per-path timer, but without one OS thread per path.
+    All keys that are due together are handed to on_batch(keys) as one list (up to
+    BATCH_MAX), in deadline order. At most max_pending keys are held; events beyond that
+    are dropped and on_overflow() runs once the queue has drained, so nothing is lost —
+    it is caught by a full pass.
+    """
+
+    def __init__(self, on_batch, on_overflow=None, max_pending: int = DEBOUNCE_LIMIT):
+        self.on_batch    = on_batch
+        self.on_overflow = on_overflow
+        self.max_pending = max_pending
+        self._heap: list = []          # (deadline, seq, key) — stale entries are skipped
+        self._pending: dict = {}       # key → [deadline, first_event]
+        self._seq = 0
+        self._overflowed = False
+        self._calls: deque = deque()   # (fn, Future) — control requests run between batches
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="vault-sync-debounce", daemon=True)
+        self.fired = 0
+        self.batches = 0
+        self.dropped = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread.is_alive():
+            self._thread.join()
+        while self._calls:
+            self._calls.popleft()[1].set_exception(RuntimeError("vault-sync.py is stopping"))
+
+    def call(self, fn) -> Future:
+        """Run fn() on the scheduler thread, ahead of any due batch, and return a Future for its result."""
+        future = Future()
+        with self._cond:
+            if self._stopped:
+                future.set_exception(RuntimeError("vault-sync.py is stopping"))
+                return future
+            self._calls.append((fn, future))
+            self._cond.notify()
+        return future
+
+    def has_calls(self) -> bool:
+        return bool(self._calls)
+
+    def run_calls(self):
+        """Run the queued call()s now. Only from the scheduler thread, e.g. between files of a long pass."""
+        while True:
+            with self._cond:
+                if not self._calls:
+                    return
+                fn, future = self._calls.popleft()
+            with profiler.profiled("request"):
+                self._run_call(fn, future)
+
+    @staticmethod
+    def _run_call(fn, future: Future):
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+
+    def schedule(self, key, delay: float):
+        now = time.monotonic()
+        with self._cond:
+            item = self._pending.get(key)
+            if item is None:
+                if len(self._pending) >= self.max_pending:
+                    self.dropped += 1
+                    self._overflowed = True
+                    return
+                item = self._pending[key] = [0.0, now]
+            item[0] = now + delay
+            self._seq += 1
+            heapq.heappush(self._heap, (item[0], self._seq, key))
+            if self._heap[0][2] == key:
+                self._cond.notify()
+
+    def depth(self) -> int:
+        """Number of keys waiting for their debounce deadline."""
+        return len(self._pending)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "queue_depth":   len(self._pending),
+                "fired":         self.fired,
+                "batches":       self.batches,
+                "dropped":       self.dropped,
+                "latency_avg_s": self.latency_total / self.fired if self.fired else 0.0,
+                "latency_max_s": self.latency_max,
+            }
+
+    def _pop_due(self):
+        """Pop every due key as [(key, first_event)], or return seconds to wait / None if idle."""
+        due = []
+        now = time.monotonic()
+        while self._heap and len(due) < BATCH_MAX:
+            deadline, _, key = self._heap[0]
+            item = self._pending.get(key)
+            if item is None or item[0] != deadline:
+                heapq.heappop(self._heap)   # Superseded by a later schedule()
+                continue
+            if deadline > now:
+                break
+            heapq.heappop(self._heap)
+            del self._pending[key]
+            due.append((key, item[1]))
+        if due:
+            return due
+        return self._heap[0][0] - now if self._heap else None
+
+    def _run(self):
+        while True:
+            overflow, call = False, None
+            with self._cond:
+                if self._stopped:
+                    return
+                if self._calls:
+                    call = self._calls.popleft()
+                else:
+                    due = self._pop_due()
+                    if not isinstance(due, list):
+                        overflow = self._overflowed and due is None
+                        if not overflow:
+                            self._cond.wait(due)
+                            continue
+                        self._overflowed = False
+            if call is not None:
+                with profiler.profiled("request"):
+                    self._run_call(*call)
+                continue
+            if overflow:
+                log("info", f"Event queue overflowed ({self.dropped} event(s) dropped) — running full pass.")
+                if self.on_overflow:
+                    try:
+                        with profiler.profiled("full pass"):
+                            self.on_overflow()
+                    except Exception as e:
+                        log("error", f"Full pass failed: {e}")
+                continue
 
-    log("info", f"Reconciling {len(rel_paths)} tracked file(s)...")
-    for rel_str in sorted(rel_paths):
-        local = cfg["local_root"]    / rel_str
-        vault = cfg["vault_project"] / rel_str
-        sync_pair(local, vault, rel_str, state, state_lock)
-    log("info", "Reconciliation complete.")
+            try:
+                with profiler.profiled("batch", f"{len(due)} path(s)"):
+                    self.on_batch([key for key, _ in due])
+            except Exception as e:
+                log("error", f"Sync failed: {e}")
+            done = time.monotonic()
+            with self._cond:
+                self.batches += 1
+                for _, first_event in due:
+                    self.fired += 1
+                    self.latency_total += done - first_event
+                    self.latency_max = max(self.latency_max, done - first_event)
+                    metrics.observe("vault_sync_event_latency_seconds", done - first_event)
 
 
 # ── Watchdog event handler ────────────────────────────────────────────────────
 
-class SyncHandler(FileSystemEventHandler):
-    """Debounced file event handler for one side (local or vault)."""
-
-    def __init__(self, cfg: dict, state: dict, state_lock: threading.Lock,
-                 debounce: float, source: str):
-        self.cfg        = cfg
-        self.state      = state
-        self.state_lock = state_lock
+def event_rel(cfg: dict, source: str, path_str: str) -> str | None:
+    """Map a watcher event path to its tracked relative POSIX path, or None if untracked."""
+    root = cfg["local_root"] if source == "local" else cfg["vault_project"]
+    try:
+        rel = Path(path_str).relative_to(root)
+    except ValueError:
+        return None
+    return rel.as_posix() if is_included(rel, cfg) else None
+
+
+def process_events(cfg: dict, state: SyncState, state_lock: threading.Lock, keys: list):
+    """Sync one debounced batch of (source, path) keys as a single transaction."""
+    rel_strs = []
+    seen = set()
+    for source, path_str in keys:
+        if echo_filter.is_echo(path_str):
+            continue
+        rel_str = event_rel(cfg, source, path_str)
+        if rel_str is not None and rel_str not in seen:
+            seen.add(rel_str)
+            rel_strs.append(rel_str)
+    sync_batch(cfg, state, state_lock, rel_strs, idle_summary=False)
+
+
+def dispatch_events(projects: dict, keys: list):
+    """Split a debounced batch of (project, source, path) keys into one batch per project."""
+    by_project: dict[str, list] = {}
+    for project, source, path_str in keys:
+        by_project.setdefault(project, []).append((source, path_str))
+    for project, project_keys in by_project.items():
+        cfg, state, state_lock = projects[project]
+        process_events(cfg, state, state_lock, project_keys)
+
+
+class SyncHandler:
+    """
+    Debounced file event handler for one side (local or vault) of one or more projects.
+
+    routes maps each project's root on this side to its project key; an event is routed
+    to the project whose root is its nearest ancestor, and dropped if there is none.
+    The observer only calls dispatch(), so this needs no watchdog base class — and the
+    module no watchdog import outside continuous mode.
+    """
+
+    def __init__(self, routes: dict, debounce: float, source: str, scheduler: DebounceScheduler,
+                 watch_sets: dict | None = None):
+        self.routes     = {os.path.normpath(str(root)): project for root, project in routes.items()}
         self.debounce   = debounce
         self.source     = source   # "local" or "vault"
-        self._timers: dict[str, threading.Timer] = {}
-        self._timer_lock = threading.Lock()
+        self.scheduler  = scheduler
+        self.watch_sets = {} if watch_sets is None else watch_sets   # project → IncludeWatches, refreshed on folder changes
+        self.delivered  = 0   # events the observer handed to this handler
+        self.scheduled  = 0   # of those, events that reached the debounce queue
+        self.unrouted   = 0
+
+    def dispatch(self, event):
+        self.delivered += 1
+        handler = getattr(self, f"on_{event.event_type}", None)   # opened / closed events are ignored
+        if handler is not None:
+            handler(event)
+
+    def _route(self, path_str: str) -> str | None:
+        path = os.path.normpath(path_str)
+        while True:
+            project = self.routes.get(path)
+            if project is not None:
+                return project
+            parent = os.path.dirname(path)
+            if parent == path:
+                return None
+            path = parent
 
     def _schedule(self, path_str: str):
-        with self._timer_lock:
-            existing = self._timers.pop(path_str, None)
-            if existing:
-                existing.cancel()
-            t = threading.Timer(self.debounce, self._process, args=[path_str])
-            self._timers[path_str] = t
-            t.start()
-
-    def _process(self, path_str: str):
-        with self._timer_lock:
-            self._timers.pop(path_str, None)
-
-        path = Path(path_str)
-        try:
-            if self.source == "local":
-                rel   = path.relative_to(self.cfg["local_root"])
-                local = path
-                vault = self.cfg["vault_project"] / rel
-            else:
-                rel   = path.relative_to(self.cfg["vault_project"])
-                vault = path
-                local = self.cfg["local_root"] / rel
-        except ValueError:
+        if echo_filter.is_echo(path_str):
             return
-
-        if not is_included(rel, self.cfg):
+        project = self._route(path_str)
+        if project is None:
+            self.unrouted += 1   # e.g. a vault note outside every project folder
             return
+        self.scheduled += 1
+        self.scheduler.schedule((project, self.source, path_str), self.debounce)
 
-        sync_pair(local, vault, rel.as_posix(), self.state, self.state_lock)
+    def _dir_changed(self, path_str: str):
+        """A folder appeared or vanished — re-plan the watches if it is on the way to an include root."""
+        watches = self.watch_sets.get(self._route(path_str))
+        if watches is None or not watches.affects(path_str):
+            return
+        cfg = watches.cfg
+        for rel_dir in watches.refresh():
+            # Files written before the new watch was in place would otherwise go unnoticed
+            for rel_str in scan_side(cfg["local_root"], cfg, roots=[rel_dir]):
+                self._schedule(str(cfg["local_root"] / rel_str))
 
     def on_modified(self, event):
         if not event.is_directory:
             self._schedule(event.src_path)
 
     def on_created(self, event):
-        if not event.is_directory:
+        if event.is_directory:
+            self._dir_changed(event.src_path)
+        else:
             self._schedule(event.src_path)
 
     def on_deleted(self, event):
-        pass  # Deletions are never propagated — too destructive
+        if event.is_directory:
+            self._dir_changed(event.src_path)
+        # Deleted files are never propagated — too destructive
+
+    def on_moved(self, event):
+        if event.is_directory:
+            self._dir_changed(event.src_path)
+            self._dir_changed(event.dest_path)
+        else:
+            self._schedule(event.dest_path)   # replay_moves() recognizes it as a move by content
+
+
+class IncludeWatches:
+    """
+    The local watches of one project, limited to its sync.include roots.
+
+    An include root that is an existing folder gets a recursive watch. A file root
+    (CLAUDE.md) or a root that does not exist yet gets a non-recursive watch on its nearest
+    existing parent folder, so creating it later is seen and refresh() upgrades the watch.
+    .pio/, .git/ and build trees outside the include roots get no inotify watches at all.
+    """
+
+    def __init__(self, observer, handler: SyncHandler, cfg: dict):
+        self.observer = observer
+        self.handler  = handler
+        self.cfg      = cfg
+        self.watches: dict[tuple, object] = {}   # (folder, recursive) → ObservedWatch
+        self.lock     = threading.Lock()
+
+    def plan(self) -> set:
+        """The (folder, recursive) watches the include roots need right now."""
+        root = self.cfg["local_root"]
+        recursive, flat = set(), set()
+        for inc in matcher_for(self.cfg).roots:
+            path = root / inc if inc else root
+            if path.is_dir():
+                recursive.add(os.path.normpath(path))
+                continue
+            parent = path.parent
+            while parent != root and not parent.is_dir():
+                parent = parent.parent
+            flat.add(os.path.normpath(parent))
+        flat = {d for d in flat if not any(d == r or d.startswith(r + os.sep) for r in recursive)}
+        return {(d, True) for d in recursive} | {(d, False) for d in flat}
+
+    def affects(self, path_str: str) -> bool:
+        """True if the folder path_str is, or leads to, an include root."""
+        try:
+            rel = Path(path_str).relative_to(self.cfg["local_root"]).as_posix()
+        except ValueError:
+            return False
+        return any(inc == rel or inc.startswith(rel + "/") for inc in matcher_for(self.cfg).roots)
+
+    def refresh(self) -> list:
+        """Bring the observer in line with plan(); return the relative folders newly watched recursively."""
+        with self.lock:
+            wanted = self.plan()
+            for key in self.watches.keys() - wanted:
+                try:
+                    self.observer.unschedule(self.watches.pop(key))
+                except (KeyError, OSError):
+                    pass   # Folder already gone — its watch died with it
+            added = []
+            for key in sorted(wanted - self.watches.keys()):
+                path, recursive = key
+                try:
+                    self.watches[key] = self.observer.schedule(self.handler, path, recursive=recursive)
+                except OSError as e:
+                    log("error", f"Cannot watch {path}: {e}")
+                    continue
+                if recursive:
+                    rel = Path(path).relative_to(self.cfg["local_root"]).as_posix()
+                    added.append("" if rel == "." else rel)
+            return added
+
+    def count(self) -> int:
+        return len(self.watches)
 
 
 # ── Lockfile ──────────────────────────────────────────────────────────────────
@@ -323,64 +2588,511 @@ def pid_running(pid: int) -> bool:
         return False
 
 
-def acquire_lock():
-    if LOCK_FILE.exists():
+def try_lock(root: Path = Path(".")) -> int | None:
+    """Take root's lockfile and return None, or return the PID of the live instance holding it."""
+    lock_file = root / LOCK_FILE
+    if lock_file.exists():
         try:
-            pid = int(LOCK_FILE.read_text().strip())
-            if pid_running(pid):
-                print(f"ERROR: vault-sync.py is already running (PID {pid}).")
-                print("       Only one instance per project is allowed.")
-                print(f"       To stop it: kill the process or delete {LOCK_FILE}")
-                sys.exit(1)
-            else:
-                log("info", f"Removing stale lockfile (PID {pid} no longer running).")
+            pid = int(lock_file.read_text().strip())
+            if pid_running(pid) and pid != os.getpid():
+                return pid
+            log("info", f"Removing stale lockfile (PID {pid} no longer running).")
         except (ValueError, OSError):
             pass  # Unreadable — overwrite
 
-    LOCK_FILE.write_text(str(os.getpid()))
+    lock_file.write_text(str(os.getpid()))
+    return None
+
+
+def acquire_lock(root: Path = Path(".")):
+    pid = try_lock(root)
+    if pid is not None:
+        print(f"ERROR: vault-sync.py is already running (PID {pid}).")
+        print("       Only one instance per project is allowed.")
+        print(f"       To stop it: kill the process or delete {root / LOCK_FILE}")
+        sys.exit(1)
 
 
-def release_lock():
+def release_lock(root: Path = Path(".")):
     try:
-        LOCK_FILE.unlink(missing_ok=True)
+        (root / LOCK_FILE).unlink(missing_ok=True)
     except OSError:
         pass
 
 
+# ── Multi-project daemon ──────────────────────────────────────────────────────
+
+def discover_projects(parent: Path) -> list:
+    """Project roots (folders holding VAULT-BLUEPRINT.md) in parent and up to two levels below."""
+    roots = []
+    for pattern in (BLUEPRINT.name, f"*/{BLUEPRINT.name}", f"*/*/{BLUEPRINT.name}"):
+        for blueprint in sorted(parent.glob(pattern)):
+            if not any(part.startswith(".") for part in blueprint.relative_to(parent).parts[:-1]):
+                roots.append(blueprint.parent.resolve())
+    return roots
+
+
+def open_project(root: Path, exclusive: bool) -> tuple | None:
+    """
+    Load one project's blueprint and state and take its lockfile.
+
+    With exclusive=True (single-project mode) a failure exits like it always has; otherwise
+    the project is skipped with a message so the daemon keeps serving the others.
+    """
+    if exclusive:
+        cfg = load_blueprint(root)
+        acquire_lock(root)
+    else:
+        try:
+            cfg = load_blueprint(root)
+        except SystemExit:
+            log("error", f"Skipping {root}: blueprint could not be loaded.")
+            return None
+        pid = try_lock(root)
+        if pid is not None:
+            log("info", f"Skipping {root}: already synced by PID {pid}.")
+            return None
+        cfg["project"] = root.name   # Names the project on its sync log lines
+    state      = load_state(root)
+    state_lock = threading.Lock()
+    configure_state(cfg, state, state_lock)
+    return cfg, state, state_lock
+
+
+def vault_watch_roots(projects: dict) -> list:
+    """The fewest folders whose recursive watches cover every project's vault folder."""
+    by_vault: dict[str, list] = {}
+    for cfg, _, _ in projects.values():
+        by_vault.setdefault(str(cfg["vault_root"]), []).append(str(cfg["vault_project"]))
+    return [os.path.commonpath(paths) for paths in by_vault.values()]
+
+
+def watch_stats(observer) -> dict:
+    """Watch count, thread count, inotify watches (Linux) and peak RSS of this process."""
+    stats = {"watches": len(observer.emitters), "threads": threading.active_count()}
+    inotify = 0
+    fdinfo = Path("/proc/self/fdinfo")
+    if fdinfo.is_dir():
+        for f in fdinfo.iterdir():
+            try:
+                inotify += f.read_text().count("inotify wd:")
+            except OSError:
+                continue
+        stats["inotify_watches"] = inotify
+    try:
+        import resource
+        stats["max_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except ImportError:
+        pass   # Windows
+    return stats
+
+
+# ── Control socket ────────────────────────────────────────────────────────────
+
+def control_listen(root: Path) -> tuple:
+    """
+    Open root's control endpoint and return (listening socket, token).
+
+    A UNIX socket at root/CONTROL_FILE where the platform has them (file mode 0600,
+    token None). Otherwise — Windows, or a project path too long for a socket address —
+    a TCP socket on 127.0.0.1 whose port and a random token are written to CONTROL_FILE;
+    requests without that token are refused.
+    """
+    import socket
+    path = root / CONTROL_FILE
+    path.unlink(missing_ok=True)   # This process holds the lockfile: anything left here is stale
+    if hasattr(socket, "AF_UNIX"):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.bind(str(path))
+            os.chmod(path, 0o600)
+            sock.listen()
+            return sock, None
+        except OSError:
+            sock.close()
+            path.unlink(missing_ok=True)
+    import secrets
+    sock  = socket.create_server(("127.0.0.1", 0))
+    token = secrets.token_hex(16)
+    _atomic_write(path, f"tcp 127.0.0.1 {sock.getsockname()[1]} {token}\n")
+    return sock, token
+
+
+def control_request(root: Path, request: dict) -> dict | None:
+    """
+    Send one request to the instance serving root and return its reply.
+
+    Returns None if no instance is reachable (no endpoint, or a stale one left by a crash),
+    so the caller can fall back to standalone mode.
+    """
+    path = root / CONTROL_FILE
+    try:
+        st = path.stat()
+    except OSError:
+        return None   # No instance has served this project since its last clean stop
+    import socket
+    try:
+        if stat.S_ISSOCK(st.st_mode):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(CONTROL_CONNECT)
+            try:
+                sock.connect(str(path))
+            except OSError:
+                sock.close()
+                raise
+        else:
+            _, host, port, token = path.read_text().split()
+            sock    = socket.create_connection((host, int(port)), CONTROL_CONNECT)
+            request = dict(request, token=token)
+    except (OSError, ValueError):
+        return None
+    with sock:
+        sock.settimeout(None)   # A reconcile may take a while
+        try:
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline()
+        except OSError as e:
+            return {"ok": False, "error": f"Control connection failed: {e}"}
+    if not line:
+        return {"ok": False, "error": "The running instance closed the connection."}
+    return json.loads(line)
+
+
+def control_rel(cfg: dict, path_str: str) -> str | None:
+    """Map an absolute path on either side (or a project-relative one) to its relative POSIX path."""
+    candidates = ([os.path.relpath(os.path.abspath(path_str), os.path.abspath(root))
+                   for root in (cfg["local_root"], cfg["vault_project"])]
+                  if os.path.isabs(path_str) else [os.path.normpath(path_str)])
+    for rel in candidates:
+        if rel != ".." and not rel.startswith(".." + os.sep):
+            return "" if rel == "." else Path(rel).as_posix()
+    return None
+
+
+class ControlServer:
+    """
+    Local control API of a running instance: one endpoint per project, in its root folder.
+
+    Each connection carries one JSON request line and gets one JSON reply line:
+        {"cmd": "sync", "paths": [...]}                    sync these files now
+        {"cmd": "reconcile", "paths": [...] | null,        reconcile these files/folders
+         "verify": false, "full": false}                   (null: the whole project)
+        {"cmd": "status"}                                  counters and open conflicts
+        {"cmd": "conflicts"}                               open conflicts with their backups
+        {"cmd": "flush"}                                   write the state snapshot now
+    Commands that touch files or state run on the scheduler thread between event batches,
+    so they never race the watcher's own syncs; the log lines they produce at the
+    request's "log_level" (debug, info or summary; default info) and above are returned
+    in the reply's "log" list.
+    """
+
+    def __init__(self, projects: dict, scheduler: DebounceScheduler, jobs: int = 1, status_extra=None):
+        self.projects     = projects
+        self.scheduler    = scheduler
+        self.jobs         = jobs
+        self.status_extra = status_extra   # () -> dict merged into every status reply
+        self.requests     = 0
+        self._listeners: list = []
+        import selectors
+        self._selector = selectors.DefaultSelector()
+        self._stopped  = False
+        self._thread   = threading.Thread(target=self._serve, name="vault-sync-control", daemon=True)
+
+    def start(self) -> list:
+        """Open every project's endpoint, start serving, and return the endpoint paths."""
+        from selectors import EVENT_READ
+        for key in self.projects:
+            try:
+                sock, token = control_listen(Path(key))
+            except OSError as e:
+                log("error", f"No control endpoint for {key}: {e}")
+                continue
+            sock.setblocking(False)
+            self._selector.register(sock, EVENT_READ, (key, token))
+            self._listeners.append((sock, Path(key) / CONTROL_FILE))
+        self._thread.start()
+        return [str(path) for _, path in self._listeners]
+
+    def stop(self):
+        self._stopped = True
+        if self._thread.is_alive():
+            self._thread.join()
+        for sock, path in self._listeners:
+            sock.close()
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass
+        self._listeners.clear()
+
+    def _serve(self):
+        while not self._stopped:
+            for selected, _ in self._selector.select(timeout=0.5):
+                try:
+                    conn, _ = selected.fileobj.accept()
+                except OSError:
+                    continue
+                conn.setblocking(True)
+                threading.Thread(target=self._handle, args=(conn, *selected.data),
+                                 name="vault-sync-request", daemon=True).start()
+        self._selector.close()
+
+    def _handle(self, conn: "socket.socket", key: str, token: str | None):
+        with conn:
+            try:
+                with conn.makefile("rb") as f:
+                    request = json.loads(f.readline())
+                if token is not None and not hmac.compare_digest(str(request.get("token", "")), token):
+                    reply = {"ok": False, "error": "Bad control token."}
+                else:
+                    self.requests += 1
+                    reply = self.execute(key, request)
+            except Exception as e:
+                reply = {"ok": False, "error": str(e)}
+            try:
+                conn.sendall(json.dumps(reply).encode() + b"\n")
+            except OSError:
+                pass   # Client went away
+
+    def _on_scheduler(self, fn, level: str = "info") -> list:
+        """Run fn() on the scheduler thread and return the log lines it produced at level and above."""
+        tap = (LOG_LEVELS.get(level, LOG_LEVELS["info"]), [])
+
+        def job():
+            _log_taps.append(tap)
+            try:
+                fn()
+            finally:
+                _log_taps.remove(tap)
+
+        self.scheduler.call(job).result()
+        return tap[1]
+
+    def execute(self, key: str, request: dict) -> dict:
+        cfg, state, state_lock = self.projects[key]
+        cmd   = request.get("cmd")
+        level = request.get("log_level", "info")
+        paths = request.get("paths")
+        rels  = None if paths is None else [control_rel(cfg, str(p)) for p in paths]
+        if rels is not None and None in rels:
+            outside = [p for p, r in zip(paths, rels) if r is None]
+            return {"ok": False, "error": f"Not inside this project or its vault folder: {', '.join(outside)}"}
+
+        if cmd == "sync":
+            matcher  = matcher_for(cfg)
+            tracked  = [r for r in rels or [] if r and matcher.matches(r)]
+            ignored  = [r for r in rels or [] if r not in tracked]
+            lines    = self._on_scheduler(lambda: sync_batch(cfg, state, state_lock, tracked, jobs=self.jobs),
+                                          level)
+            lines   += [f"Not tracked (sync.include / sync.exclude): {r or '.'}" for r in ignored]
+            return {"ok": True, "log": lines}
+        if cmd == "reconcile":
+            roots = None if rels is None or "" in rels else rels
+            lines = self._on_scheduler(lambda: reconcile(cfg, state, state_lock, bool(request.get("verify")),
+                                                         self.jobs, bool(request.get("full")), roots),
+                                      level)
+            return {"ok": True, "log": lines}
+        if cmd == "flush":
+            def flush():
+                save_state(state, state_lock)
+                log("info", f"State saved to {state.state_file}.")
+            return {"ok": True, "log": self._on_scheduler(flush, level)}
+        if cmd == "status":
+            with state_lock:
+                status = {
+                    "pid":             os.getpid(),
+                    "project":         key,
+                    "vault_project":   str(cfg["vault_project"]),
+                    "tracked":         len(state),
+                    "journal_records": state.journal_records,
+                    "conflicts":       sorted(state.conflicts),
+                }
+            status["scheduler"]       = self.scheduler.stats()
+            status["echo_suppressed"] = echo_filter.suppressed
+            status["requests"]        = self.requests
+            if self.status_extra is not None:
+                status.update(self.status_extra())
+            return {"ok": True, **status}
+        if cmd == "conflicts":
+            with state_lock:
+                conflicts = {rel: dict(c) for rel, c in state.conflicts.items()}
+            return {"ok": True, "local_root": str(cfg["local_root"]), "open_conflicts": conflicts}
+        return {"ok": False, "error": f"Unknown command: {cmd!r}"}
+
+
+def print_control_reply(reply: dict):
+    """Print a control reply the way the standalone command would have printed its work."""
+    for line in reply.get("log", []):
+        print(line)
+    if not reply.get("ok"):
+        print(f"ERROR: {reply.get('error', 'Control request failed.')}")
+        return
+    if "pid" in reply:
+        sched = reply["scheduler"]
+        print(f"vault-sync.py running (PID {reply['pid']}) for {reply['project']}")
+        print(f"  vault folder     : {reply['vault_project']}")
+        print(f"  tracked files    : {reply['tracked']}  ({reply['journal_records']} journal record(s) since last snapshot)")
+        print(f"  debounce queue   : {sched['queue_depth']} waiting, {sched['fired']} synced in "
+              f"{sched['batches']} batch(es), {sched['dropped']} dropped")
+        print(f"  echo suppressed  : {reply['echo_suppressed']}")
+        if "watch_count" in reply:
+            print(f"  watches          : {reply['watch_count']}, events delivered: "
+                  f"local {reply['watch_events_local']}, vault {reply['watch_events_vault']}")
+        print(f"  conflicts        : {len(reply['conflicts'])}")
+        for rel_str in reply["conflicts"]:
+            print(f"      {rel_str}")
+    if "open_conflicts" in reply:
+        print_conflicts(reply["open_conflicts"], Path(reply["local_root"]))
+
+
+def print_conflicts(conflicts: dict, local_root: Path):
+    """The --conflicts listing: each open conflict with its age and vault-version backup."""
+    if not conflicts:
+        print("No unresolved conflicts.")
+        return
+    print(f"Unresolved conflicts ({len(conflicts)}):")
+    for rel_str, c in sorted(conflicts.items()):
+        since  = datetime.fromtimestamp(c["since"]).strftime("%Y-%m-%d %H:%M")
+        backup = c["backup"] + ("" if (local_root / c["backup"]).exists() else "  (deleted)")
+        print(f"  {rel_str}  since {since}")
+        print(f"      vault version: {backup}")
+    print("Merge into the local file (or make both sides equal), then run vault-sync.py --once.")
+
+
 # ── Main ──────────────────────────────────────────────────────────────────────
 
 def main():
     parser = argparse.ArgumentParser(
         description="vault-sync.py — Two-way sync between project folder and Obsidian vault."
     )
+    parser.add_argument(
+        "paths", nargs="*", metavar="PATH",
+        help="With --once: reconcile only these files or folders."
+    )
     parser.add_argument(
         "--once", action="store_true",
-        help="Reconcile all tracked files once and exit (no continuous watch)."
+        help="Reconcile all tracked files once and exit (no continuous watch). "
+             "Handed to the running instance if there is one."
+    )
+    parser.add_argument(
+        "--sync", nargs="+", metavar="FILE",
+        help="Sync these files now (through the running instance if there is one), then exit."
+    )
+    parser.add_argument(
+        "--status", action="store_true",
+        help="Show the running instance's queue, counters and open conflicts, then exit."
+    )
+    parser.add_argument(
+        "--flush", action="store_true",
+        help="Make the running instance write its state snapshot now, then exit."
     )
     parser.add_argument(
         "--clean", action="store_true",
         help="List files present in the vault project folder but absent locally. Does not delete anything."
     )
+    parser.add_argument(
+        "--conflicts", action="store_true",
+        help="List unresolved conflicts and their backup files (from the running instance if "
+             "there is one), then exit."
+    )
+    parser.add_argument(
+        "--verify", action="store_true",
+        help="Re-hash every file during reconciliation instead of trusting unchanged stat signatures."
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=DEFAULT_JOBS, metavar="N",
+        help=f"Worker threads for hashing and copying during reconciliation (default {DEFAULT_JOBS})."
+    )
+    parser.add_argument(
+        "--full", action="store_true",
+        help="Re-list every folder and re-check every file at startup instead of using the directory index."
+    )
+    parser.add_argument(
+        "--stats-file", nargs="?", const=STATS_FILE, type=Path, metavar="PATH",
+        help=f"Collect sync metrics and write them as JSON to PATH (default {STATS_FILE}) "
+             f"every {STATS_INTERVAL:.0f}s and on exit."
+    )
+    parser.add_argument(
+        "--metrics-port", type=int, metavar="PORT",
+        help="Collect sync metrics and serve them for Prometheus at http://127.0.0.1:PORT/metrics."
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Time each phase (blueprint, walk, filter, hashing per side, decisions, copies, state "
+             "writes) and print a table at exit."
+    )
+    parser.add_argument(
+        "--profile-out", type=Path, metavar="PATH",
+        help="With --profile: also write PATH — a Chrome trace-event file if it ends in .json "
+             "(chrome://tracing, ui.perfetto.dev), otherwise a cProfile dump of the sync thread (pstats)."
+    )
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument(
+        "-q", "--quiet", action="store_true",
+        help="Only print pass summaries, conflicts and errors."
+    )
+    verbosity.add_argument(
+        "-v", "--verbose", action="store_true",
+        help="Also print a line for every file checked and left unchanged."
+    )
+    parser.add_argument(
+        "--log-file", type=Path, metavar="PATH",
+        help="Also append every log line (with --verbose: skip lines too) to PATH as JSON lines, "
+             "with the path, bytes and per-pass counts as separate keys."
+    )
+    parser.add_argument(
+        "--projects", nargs="+", type=Path, metavar="ROOT",
+        help="Serve several projects from this one process (daemon mode), one vault watch for all."
+    )
+    parser.add_argument(
+        "--discover", type=Path, metavar="DIR",
+        help="Daemon mode for every project with a VAULT-BLUEPRINT.md in DIR (up to two levels deep)."
+    )
     args = parser.parse_args()
-
-    cfg        = load_blueprint()
-    state      = load_state()
-    state_lock = threading.Lock()
+    args.jobs = max(1, args.jobs)
+    if args.paths and not args.once:
+        parser.error("PATH arguments need --once (or use --sync FILE ...)")
+    if args.projects or args.discover:
+        single = [name for name, given in (("PATH", args.paths), ("--sync", args.sync), ("--status", args.status),
+                                           ("--flush", args.flush), ("--clean", args.clean),
+                                           ("--conflicts", args.conflicts)) if given]
+        if single:
+            parser.error(f"{', '.join(single)} cannot be combined with --projects / --discover "
+                         "(run it in the project's folder instead)")
+    forwarded  = not (args.projects or args.discover) and (args.once or args.sync or args.status or args.flush)
+    local_only = [name for name, given in (("--profile", args.profile or args.profile_out),
+                                           ("--stats-file", args.stats_file),
+                                           ("--metrics-port", args.metrics_port),
+                                           ("--log-file", args.log_file)) if given]
+    running = control_request(Path.cwd(), {"cmd": "status"}) if forwarded and local_only else None
+    if running is not None:
+        # The work would go to the running instance, and a standalone pass next to it
+        # would race its state writes
+        print(f"ERROR: vault-sync.py is already running for this project (PID {running.get('pid')}).")
+        print(f"       It would do this work, so these options would record nothing: {', '.join(local_only)}")
+        print("       Drop them, or stop the running instance first.")
+        sys.exit(1)
+    log_level = "debug" if args.verbose else "summary" if args.quiet else "info"
+    try:
+        log_writer.configure(log_level, args.log_file)
+    except OSError as e:
+        print(f"ERROR: Cannot open log file {args.log_file}: {e}")
+        sys.exit(1)
+    atexit.register(log_writer.flush)
+    metrics.enabled = bool(args.stats_file or args.metrics_port)
+    if args.profile or args.profile_out:
+        profiler.start(args.profile_out)
+        atexit.register(profiler.finish)
+    stats = StatsWriter(args.stats_file) if args.stats_file else None
 
     if args.clean:
+        cfg = load_blueprint()
         vault_only = []
-        for f in cfg["vault_project"].rglob("*"):
-            if not f.is_file():
-                continue
-            try:
-                rel = f.relative_to(cfg["vault_project"])
-            except ValueError:
-                continue
-            if not is_included(rel, cfg):
-                continue
-            local = cfg["local_root"] / rel
+        for rel_str in scan_side(cfg["vault_project"], cfg):
+            local = cfg["local_root"] / rel_str
             if not local.exists():
-                vault_only.append(rel.as_posix())
+                vault_only.append(rel_str)
         if vault_only:
             print(f"Files in vault but absent locally ({len(vault_only)}):")
             for p in sorted(vault_only):
@@ -390,37 +3102,217 @@ def main():
             print("Clean: no orphan files found in vault.")
         return
 
-    if args.once:
-        reconcile(cfg, state, state_lock)
+    if args.conflicts:
+        # The running instance holds the current list; otherwise read the state files
+        # (load_state() writes nothing, so this is safe next to a starting watcher)
+        reply = control_request(Path.cwd(), {"cmd": "conflicts"})
+        if reply is not None:
+            print_control_reply(reply)
+            if not reply.get("ok"):
+                sys.exit(1)
+            return
+        cfg = load_blueprint()
+        print_conflicts(load_state().conflicts, cfg["local_root"])
         return
 
-    # ── Continuous mode ───────────────────────────────────────────────────────
-    acquire_lock()
+    daemon = bool(args.projects or args.discover)
+    if daemon:
+        roots = [p.resolve() for p in (args.projects or [])]
+        if args.discover:
+            roots += discover_projects(args.discover.resolve())
+        roots = list(dict.fromkeys(roots))
+    else:
+        roots = [Path.cwd()]
+
+    if not daemon and (args.once or args.sync or args.status or args.flush):
+        # Hand the work to the instance that is already watching this project, if any
+        if args.status:
+            request = {"cmd": "status"}
+        elif args.flush:
+            request = {"cmd": "flush"}
+        elif args.sync:
+            request = {"cmd": "sync", "paths": [os.path.abspath(p) for p in args.sync]}
+        else:
+            request = {"cmd": "reconcile", "paths": [os.path.abspath(p) for p in args.paths] or None,
+                       "verify": args.verify, "full": args.full}
+        request["log_level"] = log_level
+        reply = control_request(Path.cwd(), request)
+        if reply is not None:
+            print_control_reply(reply)
+            if not reply.get("ok"):
+                sys.exit(1)
+            return
+        if args.status:
+            print("vault-sync.py is not running for this project.")
+            sys.exit(1)
+        if args.flush:
+            print("vault-sync.py is not running for this project — nothing to flush.")
+            return
 
-    # Startup reconciliation — catch changes made while watcher was not running
-    reconcile(cfg, state, state_lock)
+        cfg        = load_blueprint()
+        state      = load_state()
+        state_lock = threading.Lock()
+        configure_state(cfg, state, state_lock)
+        metrics.gauge(lambda: [("vault_sync_conflicts_open", {}, len(state.conflicts)),
+                               ("vault_sync_echo_suppressed_total", {}, echo_filter.suppressed)])
+        if stats is not None:
+            atexit.register(stats.write)
+        if args.sync:
+            tracked = []
+            for path_str in args.sync:
+                rel_str = control_rel(cfg, os.path.abspath(path_str))
+                if rel_str and matcher_for(cfg).matches(rel_str):
+                    tracked.append(rel_str)
+                else:
+                    print(f"Not tracked (sync.include / sync.exclude): {path_str}")
+            with profiler.profiled("sync", f"{len(tracked)} path(s)"):
+                sync_batch(cfg, state, state_lock, tracked, jobs=args.jobs)
+                if state_dirty(state):
+                    save_state(state, state_lock)
+            return
+        roots = [control_rel(cfg, os.path.abspath(p)) for p in args.paths] or None
+        if roots is not None and None in roots:
+            print("ERROR: Paths must be inside the project folder or its vault folder.")
+            sys.exit(1)
+        with profiler.profiled("pass", cfg["local_root"]):
+            reconcile(cfg, state, state_lock, args.verify, args.jobs, args.full,
+                      None if roots is None or "" in roots else roots)
+        return
 
-    local_handler = SyncHandler(cfg, state, state_lock, LOCAL_DEBOUNCE, "local")
-    vault_handler = SyncHandler(cfg, state, state_lock, VAULT_DEBOUNCE, "vault")
+    projects: dict[str, tuple] = {}
+    for root in roots:
+        opened = open_project(root, exclusive=not daemon)
+        if opened is not None:
+            projects[str(root)] = opened
+    if not projects:
+        print("ERROR: No project to sync.")
+        sys.exit(1)
 
-    local_observer = Observer()
-    vault_observer = Observer()
+    control = None
+    server  = None
 
-    local_observer.schedule(local_handler, str(cfg["local_root"]),    recursive=True)
-    vault_observer.schedule(vault_handler, str(cfg["vault_project"]), recursive=True)
+    def release_all():
+        if control is not None:
+            control.stop()
+        if server is not None:
+            server.shutdown()
+        if stats is not None:
+            stats.stop()
+        for root in projects:
+            release_lock(Path(root))
 
-    local_observer.start()
-    vault_observer.start()
+    metrics.gauge(lambda: [
+        ("vault_sync_conflicts_open", {}, sum(len(state.conflicts) for _, state, _ in projects.values())),
+        ("vault_sync_echo_suppressed_total", {}, echo_filter.suppressed),
+    ])
 
-    log("info", f"Watching (local) {cfg['local_root']}")
-    log("info", f"Watching (vault) {cfg['vault_project']}")
+    if args.once:
+        try:
+            for cfg, state, state_lock in projects.values():
+                log("info", f"Project {cfg['local_root']}")
+                with profiler.profiled("pass", cfg["local_root"]):
+                    reconcile(cfg, state, state_lock, args.verify, args.jobs, args.full)
+        finally:
+            release_all()
+        return
+
+    # ── Continuous mode ───────────────────────────────────────────────────────
+
+    def reconcile_all():
+        for cfg, state, state_lock in projects.values():
+            reconcile(cfg, state, state_lock, jobs=args.jobs, scheduler=scheduler)
+
+    scheduler = DebounceScheduler(
+        on_batch=lambda keys: dispatch_events(projects, keys),
+        on_overflow=reconcile_all,
+    )
+    scheduler.start()
+
+    watch_sets: dict[str, IncludeWatches] = {}
+    local_handler = SyncHandler({cfg["local_root"]: key for key, (cfg, _, _) in projects.items()},
+                                LOCAL_DEBOUNCE, "local", scheduler, watch_sets)
+    vault_handler = SyncHandler({cfg["vault_project"]: key for key, (cfg, _, _) in projects.items()},
+                                VAULT_DEBOUNCE, "vault", scheduler)
+    observer = require("watchdog.observers").Observer()
+
+    def watch_gauges():
+        st  = scheduler.stats()
+        out = [("vault_sync_queue_depth", {}, st["queue_depth"]),
+               ("vault_sync_batches_total", {}, st["batches"]),
+               ("vault_sync_events_dropped_total", {}, st["dropped"])]
+        for handler in (local_handler, vault_handler):
+            for outcome, value in (("delivered", handler.delivered), ("queued", handler.scheduled),
+                                   ("unrouted", handler.unrouted)):
+                out.append(("vault_sync_events_total", {"side": handler.source, "outcome": outcome}, value))
+        return out
+
+    metrics.gauge(watch_gauges)
+    if stats is not None:
+        stats.start()
+        log("info", f"Writing metrics to {args.stats_file} every {STATS_INTERVAL:.0f}s")
+    if args.metrics_port:
+        try:
+            server = serve_metrics(args.metrics_port)
+        except OSError as e:
+            print(f"ERROR: Cannot serve metrics on port {args.metrics_port}: {e}")
+            release_all()
+            sys.exit(1)
+        log("info", f"Metrics at http://127.0.0.1:{args.metrics_port}/metrics")
+
+    # The control socket is up before the startup pass, so /sync-vault never falls back to a
+    # standalone run next to this one
+    control = ControlServer(
+        projects, scheduler, args.jobs,
+        status_extra=lambda: {
+            "watch_count":        len(observer.emitters),
+            "watch_events_local": local_handler.delivered,
+            "watch_events_vault": vault_handler.delivered,
+        },
+    )
+    for endpoint in control.start():
+        log("info", f"Control endpoint {endpoint}")
+
+    # Startup reconciliation — catch changes made while watcher was not running. It runs on the
+    # scheduler thread, so control requests arriving meanwhile are served between files.
+    def startup():
+        for cfg, state, state_lock in projects.values():
+            if daemon:
+                log("info", f"Project {cfg['local_root']}")
+            reconcile(cfg, state, state_lock, args.verify, args.jobs, args.full, scheduler=scheduler)
+
+    scheduler.call(startup).result()
+
+    # One observer thread for both sides and all projects. Locally only the include roots are
+    # watched; the vault once per vault at the deepest folder shared by its projects.
+    for key, (cfg, _, _) in projects.items():
+        watch_sets[key] = IncludeWatches(observer, local_handler, cfg)
+        watch_sets[key].refresh()
+        for path, recursive in sorted(watch_sets[key].watches):
+            log("info", f"Watching (local) {path}" + ("" if recursive else "  (top level only)"))
+    for vault_dir in vault_watch_roots(projects):
+        observer.schedule(vault_handler, vault_dir, recursive=True)
+        log("info", f"Watching (vault) {vault_dir}")
+    observer.start()
+
+    ws = watch_stats(observer)
+    log("info", f"{len(projects)} project(s): {ws['watches']} watch(es), {ws['threads']} thread(s)"
+                + (f", {ws['inotify_watches']} inotify watches" if "inotify_watches" in ws else "")
+                + (f", peak RSS {ws['max_rss_mb']:.1f} MB" if "max_rss_mb" in ws else ""))
     log("info", "Two-way sync active. Press Ctrl+C to stop.")
 
     def shutdown(sig=None, frame=None):
         log("info", "Stopping vault-sync.py...")
-        local_observer.stop()
-        vault_observer.stop()
-        release_lock()
+        watch_count = len(observer.emitters)
+        observer.stop()
+        scheduler.stop()
+        st = scheduler.stats()
+        log("info", f"Debounce: {st['fired']} path(s) in {st['batches']} batch(es), {st['dropped']} dropped, "
+                    f"latency avg {st['latency_avg_s']:.2f}s / max {st['latency_max_s']:.2f}s, "
+                    f"{echo_filter.suppressed} echo event(s) suppressed")
+        log("info", f"Watcher: {watch_count} watch(es), "
+                    f"local {local_handler.delivered} event(s) delivered / {local_handler.scheduled} queued, "
+                    f"vault {vault_handler.delivered} delivered / {vault_handler.scheduled} queued")
+        release_all()
         sys.exit(0)
 
     signal.signal(signal.SIGINT, shutdown)
@@ -431,11 +3323,9 @@ def main():
         while True:
             time.sleep(1)
     finally:
-        local_observer.stop()
-        vault_observer.stop()
-        local_observer.join()
-        vault_observer.join()
-        release_lock()
+        observer.stop()
+        observer.join()
+        release_all()
 
 
 if __name__ == "__main__":